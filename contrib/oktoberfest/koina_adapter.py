@@ -9,7 +9,7 @@ predictions into the DIA-NN workflow.
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional
 
 import cyclopts
 
@@ -47,6 +47,22 @@ class KoinaConfigAdapter:
         },
     }
 
+    # Oktoberfest settings that do not depend on the DIA-NN config; the
+    # per-call values are merged on top in from_diann_config.
+    SPECTRAL_LIBRARY_DEFAULTS: ClassVar[dict[str, Any]] = {
+        "fragmentation": "HCD",
+        "minIntensity": 5e-4,
+        "batchsize": 10000,
+    }
+    FASTA_DIGEST_DEFAULTS: ClassVar[dict[str, Any]] = {
+        "fragmentation": "HCD",
+        "digestion": "full",
+        "db": "concat",
+    }
+
+    # DIA-NN cut pattern ('K*,R*') -> Oktoberfest specialAas ('KR')
+    _CUT_SITE_STRIP = str.maketrans('', '', '*,')
+
     @classmethod
     def from_diann_config(
         cls,
@@ -59,6 +75,7 @@ class KoinaConfigAdapter:
         irt_model: Optional[str] = None,
         collision_energy: int = 30,
         output_format: str = 'msp',
+        diann_config_dict: dict[str, Any] | None = None,
     ) -> Dict[str, Any]:
         """
         Generate Oktoberfest config from DIA-NN workflow config.
@@ -73,13 +90,17 @@ class KoinaConfigAdapter:
             irt_model: Override default iRT model
             collision_energy: Collision energy for HCD (default 30)
             output_format: Library format (msp, spectronaut, etc.)
+            diann_config_dict: Already-parsed DIA-NN config; skips re-reading
+                diann_config_path when given
 
         Returns:
             Dict ready to be saved as Oktoberfest config.json
         """
-        # Load DIA-NN config
-        with open(diann_config_path, 'r') as f:
-            diann_config = json.load(f)
+        diann_config = (
+            diann_config_dict
+            if diann_config_dict is not None
+            else cls.load_diann_config(diann_config_path)
+        )
 
         # Get default models for instrument
         default_models = cls.DEFAULT_MODELS.get(instrument_type, cls.DEFAULT_MODELS['QE'])
@@ -114,31 +135,33 @@ class KoinaConfigAdapter:
             "prediction_server": prediction_server,
             "ssl": True,
             "spectralLibraryOptions": {
-                "fragmentation": "HCD",
+                **cls.SPECTRAL_LIBRARY_DEFAULTS,
                 "collisionEnergy": collision_energy,
                 "precursorCharge": [
                     diann_config.get('min_pr_charge', 2),
                     diann_config.get('max_pr_charge', 3),
                 ],
-                "minIntensity": 5e-4,
                 "nrOx": nr_ox,
-                "batchsize": 10000,
                 "format": output_format,
             },
             "fastaDigestOptions": {
-                "fragmentation": "HCD",
-                "digestion": "full",
+                **cls.FASTA_DIGEST_DEFAULTS,
                 "missedCleavages": diann_config.get('missed_cleavages', 1),
                 "minLength": diann_config.get('min_pep_len', 6),
                 "maxLength": diann_config.get('max_pep_len', 30),
                 "enzyme": enzyme,
-                "specialAas": cut_pattern.replace('*', '').replace(',', ''),
-                "db": "concat",
+                "specialAas": cut_pattern.translate(cls._CUT_SITE_STRIP),
             },
         }
 
         return oktoberfest_config
 
+    @staticmethod
+    def load_diann_config(diann_config_path: str) -> dict[str, Any]:
+        """Load a DIA-NN .config.json file."""
+        with open(diann_config_path, 'r') as f:
+            return json.load(f)
+
     @staticmethod
     def _count_oxidations(var_mods: List[List[str]]) -> int:
         """
@@ -216,6 +239,7 @@ oktoberfest -c config.json | tee oktoberfest.log.txt"""
         cls,
         diann_config_path: str,
         oktoberfest_config: Dict[str, Any],
+        diann_config_dict: dict[str, Any] | None = None,
     ) -> None:
         """
         Print parameter comparison between DIA-NN and Oktoberfest configs.
@@ -223,9 +247,14 @@ oktoberfest -c config.json | tee oktoberfest.log.txt"""
         Args:
             diann_config_path: Path to DIA-NN config
             oktoberfest_config: Generated Oktoberfest config
+            diann_config_dict: Already-parsed DIA-NN config; skips re-reading
+                diann_config_path when given
         """
-        with open(diann_config_path, 'r') as f:
-            diann_config = json.load(f)
+        diann_config = (
+            diann_config_dict
+            if diann_config_dict is not None
+            else cls.load_diann_config(diann_config_path)
+        )
 
         print("\n=== Config Parameter Mapping ===\n")
         print(f"{'Parameter':<25} {'DIA-NN':<30} {'Oktoberfest':<30}")
@@ -290,11 +319,15 @@ def main(
     if instrument not in valid_instruments:
         raise ValueError(f"Invalid instrument type: {instrument}. Must be one of {valid_instruments}")
 
+    # Parse the DIA-NN config once; generation and comparison share it
+    diann_config_dict = KoinaConfigAdapter.load_diann_config(diann_config)
+
     # Generate config
     oktoberfest_config = KoinaConfigAdapter.from_diann_config(
         diann_config_path=diann_config,
         fasta_path=fasta,
         instrument_type=instrument,
+        diann_config_dict=diann_config_dict,
     )
 
     # Save config
@@ -308,6 +341,7 @@ def main(
         KoinaConfigAdapter.print_comparison(
             diann_config,
             oktoberfest_config,
+            diann_config_dict=diann_config_dict,
         )
 
 
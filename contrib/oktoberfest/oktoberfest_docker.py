@@ -14,13 +14,17 @@ Env vars:
   OKTOBERFEST_IMAGE_VERSION  (optional: default "latest")
   OKTOBERFEST_PLATFORM       (optional: override docker --platform)
   OKTOBERFEST_EXTRA          (optional: extra docker run args)
+  OKTOBERFEST_FORCE_REFRESH  (optional: "1" to re-pull a registry image before running)
+  OKTOBERFEST_CACHE_FROM     (optional: registry image used as build cache; "" disables)
 """
 
 import os
 import sys
 import shlex
 import subprocess
-import platform
+import urllib.request
+
+from diann_runner.container_utils import exec_container, find_docker_runtime, is_apple_silicon
 
 # --- Settings ---
 # Support both direct image name and repo+version pattern (like prolfqua_docker)
@@ -34,13 +38,22 @@ else:
 
 PLATFORM_OVERRIDE = os.environ.get("OKTOBERFEST_PLATFORM", "")
 EXTRA_ARGS = shlex.split(os.environ.get("OKTOBERFEST_EXTRA", ""))
+FORCE_REFRESH = os.environ.get("OKTOBERFEST_FORCE_REFRESH", "") == "1"
+CACHE_FROM_IMAGE = os.environ.get("OKTOBERFEST_CACHE_FROM", "ghcr.io/wilhelm-lab/oktoberfest:latest")
 
 # Dockerfile URL for fallback build
 DOCKERFILE_URL = "https://raw.githubusercontent.com/wilhelm-lab/oktoberfest/development/Dockerfile"
 
-def is_apple_silicon() -> bool:
-    m = platform.machine().lower()
-    return "arm" in m or "aarch64" in m
+def container_cli() -> str:
+    """`podman` if installed (daemonless, no dockerd round-trips), else `docker`.
+
+    Falls back to "docker" when neither is on PATH so the final exec reports
+    the missing binary.
+    """
+    try:
+        return find_docker_runtime()
+    except FileNotFoundError:
+        return "docker"
 
 def detect_platform_arg() -> list[str]:
     if PLATFORM_OVERRIDE:
@@ -49,19 +62,21 @@ def detect_platform_arg() -> list[str]:
         return ["--platform", "linux/amd64"]
     return []
 
-def uid_gid_args() -> list[str]:
-    try:
-        uid = os.getuid()
-        gid = os.getgid()
-        return ["-u", f"{uid}:{gid}"]
-    except AttributeError:
-        return []  # Windows doesn't have getuid
-
 def image_exists(image_name: str) -> bool:
-    """Check if a Docker image exists locally."""
+    """Check if a Docker image exists locally.
+
+    Goes through the CLI, which resolves the engine (context, DOCKER_HOST)
+    the same way the later `run` does: `podman image exists` (exit status
+    only, no JSON) under podman, `docker image inspect` otherwise.
+    """
+    cli = container_cli()
+    if cli == "podman":
+        check_cmd = ["podman", "image", "exists", image_name]
+    else:
+        check_cmd = ["docker", "image", "inspect", image_name]
     try:
         result = subprocess.run(
-            ["docker", "image", "inspect", image_name],
+            check_cmd,
             capture_output=True,
             text=True,
             check=False
@@ -72,10 +87,10 @@ def image_exists(image_name: str) -> bool:
 
 def try_pull_image(image_name: str) -> bool:
     """Try to pull the Docker image from a registry. Returns True if successful."""
-    print(f"Image '{image_name}' not found locally. Attempting to pull...", file=sys.stderr)
+    print(f"Pulling '{image_name}'...", file=sys.stderr)
     try:
         result = subprocess.run(
-            ["docker", "pull", image_name],
+            [container_cli(), "pull", image_name],
             capture_output=False,  # Show pull progress
             check=False
         )
@@ -92,55 +107,68 @@ def build_from_dockerfile() -> bool:
     """Download Dockerfile and build image locally as fallback. Returns True if successful."""
     print(f"\nAttempting to build '{DEFAULT_IMAGE}' from Dockerfile...", file=sys.stderr)
 
-    # Create temporary directory for build
-    import tempfile
-    with tempfile.TemporaryDirectory() as tmpdir:
-        dockerfile_path = os.path.join(tmpdir, "Dockerfile")
-
-        # Download Dockerfile
-        print(f"Downloading Dockerfile from {DOCKERFILE_URL}...", file=sys.stderr)
-        try:
-            result = subprocess.run(
-                ["curl", "-fsSL", "-o", dockerfile_path, DOCKERFILE_URL],
-                capture_output=True,
-                check=False
-            )
-            if result.returncode != 0:
-                print(f"✗ Failed to download Dockerfile", file=sys.stderr)
-                return False
-        except FileNotFoundError:
-            print(f"✗ curl not found. Cannot download Dockerfile.", file=sys.stderr)
-            return False
-
-        # Build the image
-        print(f"Building Docker image '{DEFAULT_IMAGE}'...", file=sys.stderr)
-        print("This may take several minutes on first run.", file=sys.stderr)
+    # Download Dockerfile (a few KB; kept in memory and piped to `docker build -`,
+    # so no curl process, temp dir or build-context upload is needed)
+    print(f"Downloading Dockerfile from {DOCKERFILE_URL}...", file=sys.stderr)
+    try:
+        with urllib.request.urlopen(DOCKERFILE_URL, timeout=30) as response:
+            dockerfile = response.read()
+    except OSError as exc:
+        print(f"✗ Failed to download Dockerfile: {exc}", file=sys.stderr)
+        return False
 
-        platform_args = detect_platform_arg()
-        cmd = ["docker", "build"] + platform_args + ["-t", DEFAULT_IMAGE, "-f", dockerfile_path, tmpdir]
+    # Build the image
+    print(f"Building Docker image '{DEFAULT_IMAGE}'...", file=sys.stderr)
+    print("This may take several minutes on first run.", file=sys.stderr)
+
+    platform_args = detect_platform_arg()
+    # BuildKit + inline cache: a rebuild reuses unchanged layers from any
+    # previous build of DEFAULT_IMAGE instead of re-running every RUN step.
+    # The published upstream image is a second cache source, so a cold machine
+    # pulls matching layers instead of rebuilding them (a missing ref is only
+    # a warning under BuildKit).
+    # podman build has no BuildKit; it reuses its local layer cache by default.
+    cli = container_cli()
+    cache_args = []
+    if cli == "docker":
+        cache_args = [
+            "--cache-from", DEFAULT_IMAGE,
+            "--build-arg", "BUILDKIT_INLINE_CACHE=1",
+            "--progress=plain",
+        ]
+        if CACHE_FROM_IMAGE and CACHE_FROM_IMAGE != DEFAULT_IMAGE:
+            cache_args += ["--cache-from", CACHE_FROM_IMAGE]
+    cmd = [cli, "build"] + platform_args + cache_args + ["-t", DEFAULT_IMAGE, "-"]
+    env = {**os.environ, "DOCKER_BUILDKIT": "1"}
+
+    result = subprocess.run(cmd, input=dockerfile, capture_output=False, check=False, env=env)
+    if result.returncode == 0:
+        print(f"✓ Successfully built '{DEFAULT_IMAGE}'", file=sys.stderr)
+        return True
+    else:
+        print(f"✗ Failed to build image (exit code {result.returncode})", file=sys.stderr)
+        return False
 
-        result = subprocess.run(cmd, capture_output=False, check=False)
-        if result.returncode == 0:
-            print(f"✓ Successfully built '{DEFAULT_IMAGE}'", file=sys.stderr)
-            return True
-        else:
-            print(f"✗ Failed to build image (exit code {result.returncode})", file=sys.stderr)
-            return False
+def is_registry_image(image_name: str) -> bool:
+    return "/" in image_name or image_name.startswith("ghcr.io")
 
 def ensure_image_exists():
-    """Ensure Docker image exists: check local → pull from registry → build from Dockerfile."""
-    # Check if image exists locally
-    if image_exists(DEFAULT_IMAGE):
-        print(f"Using Docker image: {DEFAULT_IMAGE}", file=sys.stderr)
-        return
-
-    # Try to pull from registry (if it looks like a registry image)
-    if "/" in DEFAULT_IMAGE or DEFAULT_IMAGE.startswith("ghcr.io"):
-        if try_pull_image(DEFAULT_IMAGE):
+    """Ensure Docker image exists: check local → pull from registry → build from Dockerfile.
+
+    Registry images are left to `docker run --pull=missing` (see build_docker_cmd)
+    unless OKTOBERFEST_FORCE_REFRESH=1 asks for an explicit pull, so on the
+    common path only local image names are checked here.
+    """
+    if is_registry_image(DEFAULT_IMAGE):
+        if not FORCE_REFRESH or try_pull_image(DEFAULT_IMAGE):
+            return
+    else:
+        # Check if image exists locally
+        if image_exists(DEFAULT_IMAGE):
+            print(f"Using Docker image: {DEFAULT_IMAGE}", file=sys.stderr)
             return
 
-    # Try to build from Dockerfile as fallback (only for local image names)
-    if "/" not in DEFAULT_IMAGE:
+        # Try to build from Dockerfile as fallback (only for local image names)
         print(f"\nImage '{DEFAULT_IMAGE}' is a local name. Trying to build from Dockerfile...", file=sys.stderr)
         if build_from_dockerfile():
             return
@@ -160,9 +188,13 @@ def ensure_image_exists():
     sys.exit(1)
 
 def build_docker_cmd(argv: list[str]) -> list[str]:
-    cmd = ["docker", "run", "--rm"]
+    cmd = [container_cli(), "run", "--rm"]
+    if is_registry_image(DEFAULT_IMAGE):
+        # The daemon pulls a missing registry image itself; a local-only name
+        # must not be resolved against Docker Hub, so it is built beforehand.
+        cmd += ["--pull=missing"]
     cmd += detect_platform_arg()
-    # NOTE: Don't use uid_gid_args() because oktoberfest files are in /root
+    # NOTE: Don't pass -u uid:gid because oktoberfest files are in /root
     # and non-root users can't read them
 
     # Mount current directory to /work
@@ -171,10 +203,11 @@ def build_docker_cmd(argv: list[str]) -> list[str]:
     if EXTRA_ARGS:
         cmd += EXTRA_ARGS
 
-    cmd += [DEFAULT_IMAGE]
-    # Use bash to set PYTHONPATH, cd to /work, then run oktoberfest
-    bash_cmd = "export PYTHONPATH=/root && cd /work && python -m oktoberfest " + " ".join(shlex.quote(arg) for arg in argv)
-    cmd += ["bash", "-c", bash_cmd]
+    # Set PYTHONPATH and the working dir via docker itself rather than a
+    # `bash -c` wrapper: no extra shell in the container, no re-quoting of
+    # argv, and signals go straight to python.
+    cmd += ["-w", "/work", "-e", "PYTHONPATH=/root"]
+    cmd += [DEFAULT_IMAGE, "python", "-m", "oktoberfest", *argv]
     return cmd
 
 def main():
@@ -202,14 +235,10 @@ Example workflow:
     oktoberfest_args = sys.argv[1:]
     docker_cmd = build_docker_cmd(oktoberfest_args)
 
-    # Pretty print the command for debugging
-    print("→ Running:", " ".join(shlex.quote(x) for x in docker_cmd), file=sys.stderr)
     try:
-        # Stream output directly
-        completed = subprocess.run(docker_cmd)
-        sys.exit(completed.returncode)
+        exec_container(docker_cmd)
     except FileNotFoundError:
-        print("Error: Docker not found. Please install Docker Desktop and ensure `docker` is on PATH.",
+        print("Error: Docker not found. Please install Docker Desktop (or podman) and ensure it is on PATH.",
               file=sys.stderr)
         sys.exit(127)
 
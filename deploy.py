@@ -1,9 +1,12 @@
 """Helper functions for deploy.smk"""
 
+import functools
+import hashlib
 import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -114,11 +117,62 @@ def load_msconvert_image() -> str:
     return _load_server_docker_images()["msconvert_docker"]
 
 
+SRC_DIGEST_LABEL = "diann_runner.src_digest"
+
+# Header plus the images deploy.smk builds, matched over the raw
+# `docker images` table in one pass instead of per-line lower()/substring tests.
+_IMAGE_LINE_RE = re.compile(r"(?im)^(REPOSITORY.*|.*(?:diann|thermorawfileparser).*)$")
+
+
+def dockerfile_digest(dockerfile: str | Path, build_args: dict[str, str] | None = None) -> str:
+    """Content digest of a Dockerfile plus the build args it is built with.
+
+    deploy.smk stamps it on each image as the ``diann_runner.src_digest``
+    label. An existing image is only reused when its label matches, so an
+    edited Dockerfile (or a different ``DIANN_VERSION``) triggers a rebuild
+    instead of silently keeping the stale image.
+    """
+    h = hashlib.sha256(Path(dockerfile).read_bytes())
+    for key, value in sorted((build_args or {}).items()):
+        h.update(f"\0{key}={value}".encode())
+    return h.hexdigest()[:16]
+
+
+@functools.cache
 def check_command(cmd: str) -> bool:
-    """Check if a command is available in PATH."""
+    """Check if a command is available in PATH (cached; PATH is stable per run)."""
     return shutil.which(cmd) is not None
 
 
+@functools.cache
+def _probe(argv: tuple[str, ...]) -> subprocess.CompletedProcess:
+    """Run a probe command once per Snakemake process.
+
+    deploy.smk imports this module once, so e.g. the ``docker ps`` daemon
+    check shared by the docker and apptainer prerequisite rules only spawns
+    a single subprocess per run.
+    """
+    return subprocess.run(list(argv), capture_output=True, text=True)
+
+
+def _run_probes(checks: list[tuple[str, list[str]]]) -> dict[str, subprocess.CompletedProcess]:
+    """Run several ``<tool> --version``-style probes concurrently.
+
+    Each probe is a short-lived subprocess whose cost is dominated by process
+    creation and (for docker) the daemon round-trip, so running them on a
+    thread pool brings the wall time down to roughly the slowest single probe.
+    Results are keyed by label so callers can report them in a fixed order.
+    """
+    if not checks:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(checks)) as ex:
+        futures = {
+            label: ex.submit(_probe, tuple(argv))
+            for label, argv in checks
+        }
+        return {label: future.result() for label, future in futures.items()}
+
+
 def check_prerequisites(output_flag: Path) -> None:
     """
     Verify Docker is available and running.
@@ -134,11 +188,13 @@ def check_prerequisites(output_flag: Path) -> None:
 
     # Check Docker
     if check_command("docker"):
-        result = subprocess.run(["docker", "--version"], capture_output=True, text=True)
-        print(f"✓ {result.stdout.strip()}")
+        results = _run_probes([
+            ("version", ["docker", "--version"]),
+            ("daemon", ["docker", "ps"]),
+        ])
+        print(f"✓ {results['version'].stdout.strip()}")
 
-        result = subprocess.run(["docker", "ps"], capture_output=True)
-        if result.returncode == 0:
+        if results["daemon"].returncode == 0:
             print("✓ Docker daemon is running")
         else:
             print("✗ Docker daemon is not running")
@@ -157,6 +213,38 @@ def check_prerequisites(output_flag: Path) -> None:
     output_flag.touch()
 
 
+@functools.lru_cache(maxsize=1)
+def _docker_images() -> dict[str, str]:
+    """Local docker images as ``{"repo:tag": "<size> (created <since>)"}``.
+
+    One ``docker images`` call answers every existence/detail query made in
+    this process. Call ``_docker_images.cache_clear()`` after building or
+    removing images.
+    """
+    result = subprocess.run(
+        ["docker", "images", "--format", "{{.Repository}}:{{.Tag}}\t{{.Size}} (created {{.CreatedSince}})"],
+        capture_output=True,
+        text=True
+    )
+    images = {}
+    for line in result.stdout.splitlines():
+        ref, _, detail = line.partition("\t")
+        images.setdefault(ref, detail)
+    return images
+
+
+def _image_ref(name: str) -> str:
+    """``repo[:tag]`` as listed by ``docker images`` (tag defaults to ``latest``)."""
+    if ":" not in name.rsplit("/", 1)[-1]:
+        return f"{name}:latest"
+    return name
+
+
+def docker_image_exists(name: str) -> bool:
+    """Check whether ``name`` (``repo[:tag]``, tag defaults to ``latest``) exists locally."""
+    return _image_ref(name) in _docker_images()
+
+
 def check_docker_images() -> None:
     """Check that every DIA-NN image in the build matrix (plus the
     thermorawfileparser converter) is present locally.
@@ -171,24 +259,14 @@ def check_docker_images() -> None:
     images_to_check = [m["tag"] for m in load_diann_build_matrix()]
     images_to_check.append("thermorawfileparser:2.0.0")
 
-    result = subprocess.run(
-        ["docker", "images", "--format", "{{.Repository}}:{{.Tag}}"],
-        capture_output=True,
-        text=True
-    )
-    available_images = set(result.stdout.strip().split("\n"))
+    available_images = _docker_images()
 
     all_present = True
     for image_name in images_to_check:
         display_name = image_name
-        if image_name in available_images:
-            # Get image details
-            detail = subprocess.run(
-                ["docker", "images", image_name, "--format", "{{.Size}} (created {{.CreatedSince}})"],
-                capture_output=True,
-                text=True
-            )
-            print(f"✓ {display_name}: {detail.stdout.strip()}")
+        ref = _image_ref(image_name)
+        if ref in available_images:
+            print(f"✓ {display_name}: {available_images[ref]}")
         else:
             print(f"✗ {display_name}: NOT FOUND")
             all_present = False
@@ -219,16 +297,25 @@ def check_apptainer_prerequisites(output_flag: Path) -> None:
 
     all_good = True
 
-    if check_command("apptainer"):
-        result = subprocess.run(["apptainer", "--version"], capture_output=True, text=True)
-        print(f"✓ {result.stdout.strip()}")
+    # PATH lookups are cheap and stay on the main thread; only the
+    # subprocess probes for the tools that exist are run concurrently.
+    has_apptainer = check_command("apptainer")
+    has_docker = check_command("docker")
+    checks = []
+    if has_apptainer:
+        checks.append(("apptainer", ["apptainer", "--version"]))
+    if has_docker:
+        checks.append(("docker", ["docker", "ps"]))
+    results = _run_probes(checks)
+
+    if has_apptainer:
+        print(f"✓ {results['apptainer'].stdout.strip()}")
     else:
         print("✗ apptainer not found on PATH")
         all_good = False
 
-    if check_command("docker"):
-        result = subprocess.run(["docker", "ps"], capture_output=True)
-        if result.returncode == 0:
+    if has_docker:
+        if results["docker"].returncode == 0:
             print("✓ Docker daemon is running (needed for docker-daemon:// pulls)")
         else:
             print("✗ Docker daemon not running — docker-daemon:// pulls will fail")
@@ -328,9 +415,8 @@ def print_deployment_complete(output_flag: Path) -> None:
         text=True
     )
 
-    for line in result.stdout.split("\n"):
-        if "diann" in line.lower() or "thermorawfileparser" in line.lower() or line.startswith("REPOSITORY"):
-            print(f"  {line}")
+    for m in _IMAGE_LINE_RE.finditer(result.stdout):
+        print(f"  {m.group(1)}")
 
     print("=" * 60)
     print("\nTest with:")
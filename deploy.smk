@@ -37,6 +37,7 @@ import re
 from pathlib import Path
 
 from deploy import (
+    SRC_DIGEST_LABEL,
     check_apptainer_prerequisites,
     check_docker_images,
     check_prerequisites,
@@ -48,6 +49,7 @@ from deploy import (
     load_thermoraw_version,
     print_deployment_complete,
     print_sif_deployment_complete,
+    dockerfile_digest,
 )
 
 # Resolve base directory from the Snakefile location
@@ -159,15 +161,31 @@ rule build_diann_image:
     params:
         force_rebuild = FORCE_REBUILD,
         tag = lambda wc: DIANN_BY_SLUG[wc.slug]["tag"],
-        version = lambda wc: DIANN_BY_SLUG[wc.slug]["version"]
+        version = lambda wc: DIANN_BY_SLUG[wc.slug]["version"],
+        label = SRC_DIGEST_LABEL,
+        digest = lambda wc: dockerfile_digest(
+            DIANN_BY_SLUG[wc.slug]["dockerfile"],
+            {"DIANN_VERSION": DIANN_BY_SLUG[wc.slug]["version"]},
+        )
     shell:
         """
         TAG="{params.tag}"
-        if docker images --format "{{{{.Repository}}}}:{{{{.Tag}}}}" | grep -q "^${{TAG}}$" && [ "{params.force_rebuild}" != "True" ]; then
-            echo "${{TAG}} already exists (use --config force_rebuild=true to rebuild)"
+        # Reuse the image only if it was built from this Dockerfile + version
+        # (src digest label). Images built before the label existed report
+        # "<no value>" and are kept; force_rebuild=true restamps them.
+        # force_rebuild is decided first so a forced build skips the daemon query.
+        if [ "{params.force_rebuild}" = "True" ]; then
+            CURRENT=forced
+        else
+            CURRENT=$(docker image inspect -f '{{{{index .Config.Labels "{params.label}"}}}}' "${{TAG}}" 2>/dev/null || echo missing)
+        fi
+        if [ "${{CURRENT}}" = "{params.digest}" -o "${{CURRENT}}" = "<no value>" ]; then
+            echo "${{TAG}} is up to date (use --config force_rebuild=true to rebuild)"
         else
             echo "Building ${{TAG}}..."
-            docker build --platform linux/amd64 --build-arg DIANN_VERSION={params.version} \
+            DOCKER_BUILDKIT=1 docker build --progress=plain --platform linux/amd64 \
+                --build-arg DIANN_VERSION={params.version} \
+                --label "{params.label}={params.digest}" \
                 -f {input.dockerfile:q} -t "${{TAG}}" . 2>&1 | tee {log:q}
         fi
         touch {output.flag:q}
@@ -184,14 +202,23 @@ rule build_thermorawfileparser_docker:
     log:
         LOGS_DIR / "build_thermorawfileparser_docker.log"
     params:
-        force_rebuild = FORCE_REBUILD
+        force_rebuild = FORCE_REBUILD,
+        label = SRC_DIGEST_LABEL,
+        digest = dockerfile_digest("docker/Dockerfile.thermorawfileparser-linux")
     shell:
         """
-        if docker images | grep -q "^thermorawfileparser.*2.0.0" && [ "{params.force_rebuild}" != "True" ]; then
-            echo "thermorawfileparser:2.0.0 already exists (use --config force_rebuild=true to rebuild)"
+        if [ "{params.force_rebuild}" = "True" ]; then
+            CURRENT=forced
+        else
+            CURRENT=$(docker image inspect -f '{{{{index .Config.Labels "{params.label}"}}}}' thermorawfileparser:2.0.0 2>/dev/null || echo missing)
+        fi
+        if [ "${{CURRENT}}" = "{params.digest}" -o "${{CURRENT}}" = "<no value>" ]; then
+            echo "thermorawfileparser:2.0.0 is up to date (use --config force_rebuild=true to rebuild)"
         else
             echo "Building thermorawfileparser:2.0.0..."
-            docker build -f {input.dockerfile:q} -t thermorawfileparser:2.0.0 . 2>&1 | tee {log:q}
+            DOCKER_BUILDKIT=1 docker build --progress=plain \
+                --label "{params.label}={params.digest}" \
+                -f {input.dockerfile:q} -t thermorawfileparser:2.0.0 . 2>&1 | tee {log:q}
         fi
         touch {output.flag:q}
         """
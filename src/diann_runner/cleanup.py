@@ -7,15 +7,21 @@ It uses Snakemake's built-in output tracking to properly clean all generated fil
 including partially generated outputs like .mzML files from interrupted conversions.
 """
 
+import os
 import subprocess
 import sys
-from importlib.resources import files
+from pathlib import Path
 
+from diann_runner.snakemake_cli import get_snakefile_path
 
-def get_snakefile_path() -> str:
-    """Get the path to the bundled Snakefile."""
-    snakefile = files("diann_runner").joinpath("Snakefile.DIANN3step.smk")
-    return str(snakefile)
+
+def has_snakemake_locks(workdir: Path) -> bool:
+    """True if a killed run left lock files under ``workdir/.snakemake/locks``."""
+    try:
+        with os.scandir(workdir / ".snakemake" / "locks") as it:
+            return any(True for _ in it)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
 
 
 def main():
@@ -24,17 +30,23 @@ def main():
 
     # Build snakemake command with --delete-all-output
     # --rerun-incomplete handles killed jobs that left incomplete files
-    # --unlock handles killed jobs that left directory locked
-    cmd = ["snakemake", "-s", snakefile_path, "--unlock"]
-    subprocess.run(cmd, capture_output=True)  # Unlock first, ignore errors if not locked
+    # --unlock handles killed jobs that left directory locked; only pay for
+    # the extra snakemake start-up when there actually is a lock to remove.
+    if has_snakemake_locks(Path.cwd()):
+        cmd = ["snakemake", "-s", snakefile_path, "--unlock"]
+        # Output is ignored, so discard it rather than buffering it in pipes
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
 
     cmd = ["snakemake", "-s", snakefile_path, "--delete-all-output", "--rerun-incomplete"]
 
     # Pass through any additional arguments (e.g., -n for dry-run)
     cmd.extend(sys.argv[1:])
 
-    result = subprocess.run(cmd)
-    sys.exit(result.returncode)
+    # Replace this process with snakemake: nothing runs after it, and its exit
+    # status and signals then reach the caller directly.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvp(cmd[0], cmd)
 
 
 if __name__ == "__main__":
@@ -10,23 +10,40 @@ Runtime is selected by what is installed on the host
 
 from __future__ import annotations
 
+import functools
 import os
-import platform
 import shlex
 import shutil
 import subprocess
 import sys
-from typing import Literal
+from typing import Literal, NoReturn
 
 Runtime = Literal["docker", "apptainer"]
 
 
+@functools.lru_cache(maxsize=1)
 def is_apple_silicon() -> bool:
-    """Check if running on Apple Silicon."""
-    m = platform.machine().lower()
+    """Check if running on Apple Silicon (cached; the host does not change)."""
+    # os.uname() is a single syscall; the container wrappers only run on POSIX.
+    m = os.uname().machine.lower() if hasattr(os, "uname") else ""
     return "arm" in m or "aarch64" in m
 
 
+@functools.lru_cache(maxsize=1)
+def _uid_gid() -> str | None:
+    """``"uid:gid"`` of this process, or ``None`` where the OS has no uids."""
+    if not hasattr(os, "getuid"):
+        return None
+    return f"{os.getuid()}:{os.getgid()}"
+
+
+@functools.cache
+def _resource_limit_args(shm_size: str, nofile_limit: int, ipc_host: bool) -> tuple[str, ...]:
+    """Docker resource flags, built once per distinct setting (usually just the defaults)."""
+    args = ("--shm-size", shm_size, "--ulimit", f"nofile={nofile_limit}:{nofile_limit}")
+    return args + ("--ipc", "host") if ipc_host else args
+
+
 def detect_runtime() -> Runtime:
     """Select container runtime based on what is installed on the host.
 
@@ -43,8 +60,13 @@ def detect_runtime() -> Runtime:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def find_docker_runtime() -> str:
-    """Return `podman` or `docker` (in that order) if either is available."""
+    """Return `podman` or `docker` (in that order) if either is available.
+
+    Cached per process, since every ContainerCommandBuilder asks; call
+    ``find_docker_runtime.cache_clear()`` after changing PATH.
+    """
     for runtime in ("podman", "docker"):
         if shutil.which(runtime):
             return runtime
@@ -68,6 +90,25 @@ def run_container(
     return subprocess.run(cmd).returncode
 
 
+def exec_container(
+    cmd: list[str],
+    print_cmd: bool = True,
+    label: str = "Running",
+) -> NoReturn:
+    """Replace the current process with the container command.
+
+    For thin CLI wrappers whose only remaining job is to propagate the exit
+    status: the Python interpreter does not stay resident for the length of
+    the (often hours-long) container run, and signals from the scheduler reach
+    the container client directly.
+    """
+    if print_cmd:
+        print_command(cmd, label)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvp(cmd[0], cmd)
+
+
 class ContainerCommandBuilder:
     """Build a container invocation for either docker or apptainer.
 
@@ -123,10 +164,9 @@ class ContainerCommandBuilder:
     def with_uid_gid(self, flag: str = "-u") -> "ContainerCommandBuilder":
         if self.runtime != "docker":
             return self
-        try:
-            self._docker_args.extend([flag, f"{os.getuid()}:{os.getgid()}"])
-        except AttributeError:
-            pass
+        uid_gid = _uid_gid()
+        if uid_gid is not None:
+            self._docker_args.extend([flag, uid_gid])
         return self
 
     def with_mount(
@@ -179,10 +219,7 @@ class ContainerCommandBuilder:
     ) -> "ContainerCommandBuilder":
         if self.runtime != "docker":
             return self
-        self._docker_args.extend(["--shm-size", shm_size])
-        self._docker_args.extend(["--ulimit", f"nofile={nofile_limit}:{nofile_limit}"])
-        if ipc_host:
-            self._docker_args.extend(["--ipc", "host"])
+        self._docker_args.extend(_resource_limit_args(shm_size, nofile_limit, ipc_host))
         return self
 
     def with_wine_compat(self, wineprefix: str = "/tmp/.wine") -> "ContainerCommandBuilder":
@@ -14,7 +14,6 @@ Note: Use relative paths or run from your data directory.
 """
 
 import os
-import sys
 from typing import Annotated
 
 import cyclopts
@@ -22,7 +21,7 @@ import cyclopts
 from diann_runner.container_utils import (
     ContainerCommandBuilder,
     Runtime,
-    run_container,
+    exec_container,
 )
 
 app = cyclopts.App(
@@ -103,8 +102,7 @@ def run(
         diann-docker --image diann:2.3.2 --mount /srv/gstore/raw:/raw:ro --f /raw/sample.raw ...
     """
     cmd = build_container_cmd(list(diann_args), image, runtime, platform, mounts=mount)
-    returncode = run_container(cmd)
-    sys.exit(returncode)
+    exec_container(cmd)
 
 
 def main():
@@ -28,6 +28,9 @@ DIANN_BIN = "diann-docker"
 _MISSING = object()
 
 
+_VAR_MOD_RE = re.compile(r"--var-mod UniMod:(\d+),([0-9.]+),([A-Z^]+)")
+
+
 def parse_var_mods_string(var_mods_str):
     """Parse a variable-modifications string into (unimod_id, mass, residues) tuples.
 
@@ -36,8 +39,8 @@ def parse_var_mods_string(var_mods_str):
     """
     if not var_mods_str or var_mods_str == "None":
         return []
-    pattern = r"--var-mod UniMod:(\d+),([0-9.]+),([A-Z^]+)"
-    return [(unimod_id, mass, residues) for unimod_id, mass, residues in re.findall(pattern, var_mods_str)]
+    # Three capture groups, so findall already yields the (id, mass, residues) tuples.
+    return _VAR_MOD_RE.findall(var_mods_str)
 
 
 def _to_bool(value: Any) -> bool:
@@ -70,7 +73,7 @@ def _pg_level(value: Any) -> int:
 
 def _parse_var_mods(value: Any) -> list[tuple[str, str, str]]:
     """Variable-modifications string -> list of ``(unimod_id, mass, residues)`` tuples."""
-    return [tuple(m) for m in parse_var_mods_string(value)]
+    return parse_var_mods_string(value)
 
 
 @dataclass(frozen=True)
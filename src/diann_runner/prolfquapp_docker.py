@@ -14,7 +14,6 @@ Note: Use relative paths or run from your data directory.
 """
 
 import os
-import sys
 from typing import Annotated
 
 import cyclopts
@@ -22,7 +21,7 @@ import cyclopts
 from diann_runner.container_utils import (
     ContainerCommandBuilder,
     Runtime,
-    run_container,
+    exec_container,
 )
 
 app = cyclopts.App(
@@ -65,8 +64,7 @@ def run(
         prolfquapp-docker --image prolfqua/prolfquapp:2.0.8 prolfqua_qc.sh --indir out-DIANN -s DIANN
     """
     cmd = build_container_cmd(image, runtime, list(container_args))
-    returncode = run_container(cmd)
-    sys.exit(returncode)
+    exec_container(cmd)
 
 
 def main():
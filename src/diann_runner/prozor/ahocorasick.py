@@ -30,6 +30,9 @@ class Match:
 class AhoCorasickBase(ABC):
     """Abstract base class for Aho-Corasick implementations."""
 
+    #: True if searching releases the GIL, so threads can search in parallel
+    releases_gil: bool = False
+
     @abstractmethod
     def find_all(self, text: str) -> Iterator[Match]:
         """Find all keyword matches in text.
@@ -62,6 +65,8 @@ class AhoCorasickPure(AhoCorasickBase):
 class AhoCorasickRust(AhoCorasickBase):
     """Fast Rust implementation using ahocorasick_rs."""
 
+    releases_gil = True
+
     def __init__(self, keywords: Iterable[str], case_sensitive: bool = True):
         import ahocorasick_rs
 
@@ -82,6 +87,26 @@ class AhoCorasickRust(AhoCorasickBase):
             yield Match(keyword=self._keywords[idx], start=start, end=end)
 
 
+class StrFindSearch(AhoCorasickBase):
+    """Search a handful of keywords with repeated ``str.find``.
+
+    Not an automaton: each keyword is scanned separately, which beats
+    building a trie when there are only a few keywords. Matches, including
+    overlapping ones, are the same as the automaton backends; only their
+    order within a text differs (by keyword, then position).
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._keywords = list(keywords)
+
+    def find_all(self, text: str) -> Iterator[Match]:
+        for kw in self._keywords:
+            start = text.find(kw)
+            while start >= 0:
+                yield Match(keyword=kw, start=start, end=start + len(kw))
+                start = text.find(kw, start + 1)
+
+
 def create_automaton(
     keywords: Iterable[str],
     backend: str = "auto",
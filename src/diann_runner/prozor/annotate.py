@@ -5,10 +5,35 @@ This module provides efficient peptide-to-protein mapping by searching
 for all peptide sequences within protein sequences simultaneously.
 """
 
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable
+from functools import partial
+from itertools import chain
 
-from diann_runner.prozor.ahocorasick import create_automaton
+import numpy as np
+
+from diann_runner.prozor.ahocorasick import (
+    AhoCorasickBase,
+    StrFindSearch,
+    create_automaton,
+)
+
+_FASTA_CHUNK_SIZE = 1 << 22
+# Below this many proteins a thread pool costs more than it saves
+_PARALLEL_MIN_PROTEINS = 1000
+# Up to this many peptides, str.find per peptide beats building an automaton
+_STR_FIND_MAX_PEPTIDES = 8
+_MET = ord("M")
+
+
+def _residue_table(residues: str) -> bytes:
+    """Return a 256-entry lookup table that is 1 at the given residues' codes."""
+    table = bytearray(256)
+    for code in residues.encode("ascii"):
+        table[code] = 1
+    return bytes(table)
 
 
 @dataclass(frozen=True, slots=True)
@@ -26,27 +51,90 @@ class PeptideAnnotation:
         return len(self.peptide)
 
 
-@dataclass
 class AnnotationResult:
-    """Collection of peptide-protein annotations."""
+    """Collection of peptide-protein annotations.
+
+    Matches are stored as parallel columns (``peptides_arr``,
+    ``protein_ids_arr``, ``starts``, ``ends``) rather than one
+    :class:`PeptideAnnotation` per match; annotation objects are only built
+    when iterating.
+    """
+
+    def __init__(self, annotations: Iterable[PeptideAnnotation] = ()):
+        annotations = list(annotations)
+        self._set_columns(
+            [a.peptide for a in annotations],
+            [a.protein_id for a in annotations],
+            [a.start for a in annotations],
+            [a.end for a in annotations],
+        )
 
-    annotations: list[PeptideAnnotation]
+    @classmethod
+    def from_columns(
+        cls,
+        peptides: Sequence[str],
+        protein_ids: Sequence[str],
+        starts: Sequence[int],
+        ends: Sequence[int],
+    ) -> "AnnotationResult":
+        """Build a result from parallel per-match columns."""
+        result = cls.__new__(cls)
+        result._set_columns(peptides, protein_ids, starts, ends)
+        return result
+
+    def _set_columns(self, peptides, protein_ids, starts, ends) -> None:
+        self.peptides_arr = np.array(peptides, dtype=object)
+        self.protein_ids_arr = np.array(protein_ids, dtype=object)
+        self.starts = np.asarray(starts, dtype=np.int32)
+        self.ends = np.asarray(ends, dtype=np.int32)
+
+    def _take(self, indices) -> "AnnotationResult":
+        return AnnotationResult.from_columns(
+            self.peptides_arr[indices],
+            self.protein_ids_arr[indices],
+            self.starts[indices],
+            self.ends[indices],
+        )
 
     def __len__(self) -> int:
-        return len(self.annotations)
+        return len(self.peptides_arr)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            np.array_equal(self.peptides_arr, other.peptides_arr)
+            and np.array_equal(self.protein_ids_arr, other.protein_ids_arr)
+            and np.array_equal(self.starts, other.starts)
+            and np.array_equal(self.ends, other.ends)
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(annotations={self.annotations!r})"
+
+    def __iter__(self) -> Iterator[PeptideAnnotation]:
+        return map(
+            PeptideAnnotation,
+            self.peptides_arr.tolist(),
+            self.protein_ids_arr.tolist(),
+            self.starts.tolist(),
+            self.ends.tolist(),
+        )
 
-    def __iter__(self):
-        return iter(self.annotations)
+    @property
+    def annotations(self) -> list[PeptideAnnotation]:
+        """All matches as PeptideAnnotation objects."""
+        return list(self)
 
     @property
     def peptides(self) -> set[str]:
         """Unique peptides in the annotations."""
-        return {a.peptide for a in self.annotations}
+        return set(self.peptides_arr.tolist())
 
     @property
     def proteins(self) -> set[str]:
         """Unique proteins in the annotations."""
-        return {a.protein_id for a in self.annotations}
+        return set(self.protein_ids_arr.tolist())
 
     def filter_tryptic(
         self,
@@ -69,21 +157,31 @@ class AnnotationResult:
         Returns:
             New AnnotationResult with only tryptic peptides
         """
-        filtered = []
-        for ann in self.annotations:
-            seq = proteins.get(ann.protein_id, "")
+        is_prefix = _residue_table(prefix_residues)
+
+        keep = []
+        # annotate_peptides emits matches protein by protein, so the sequence
+        # is looked up and ASCII-encoded once per run of equal protein_id.
+        protein_id = None
+        seq = b""
+        for i, (pid, start) in enumerate(
+            zip(self.protein_ids_arr.tolist(), self.starts.tolist())
+        ):
+            if pid != protein_id:
+                protein_id = pid
+                seq = proteins.get(protein_id, "").encode("ascii", "replace")
             if not seq:
                 continue
 
-            if ann.start == 0:
+            if start == 0:
                 if allow_n_term:
-                    filtered.append(ann)
-            elif ann.start == 1 and allow_after_init_met and seq[0] == "M":
-                filtered.append(ann)
-            elif ann.start > 0 and seq[ann.start - 1] in prefix_residues:
-                filtered.append(ann)
+                    keep.append(i)
+            elif start == 1 and allow_after_init_met and seq[0] == _MET:
+                keep.append(i)
+            elif start > 0 and is_prefix[seq[start - 1]]:
+                keep.append(i)
 
-        return AnnotationResult(annotations=filtered)
+        return self._take(np.array(keep, dtype=np.intp))
 
     def to_dataframe(self):
         """Convert to pandas DataFrame.
@@ -94,16 +192,17 @@ class AnnotationResult:
         import pandas as pd
 
         return pd.DataFrame(
-            [
-                {
-                    "peptide": a.peptide,
-                    "protein_id": a.protein_id,
-                    "start": a.start,
-                    "end": a.end,
-                    "length": a.length,
-                }
-                for a in self.annotations
-            ]
+            {
+                "peptide": self.peptides_arr,
+                "protein_id": self.protein_ids_arr,
+                "start": self.starts,
+                "end": self.ends,
+                "length": np.fromiter(
+                    map(len, self.peptides_arr.tolist()),
+                    dtype=np.int32,
+                    count=len(self),
+                ),
+            }
         )
 
     def to_sparse_matrix(self, weighting: str | None = None):
@@ -120,6 +219,35 @@ class AnnotationResult:
         return PeptideProteinMatrix.from_annotations(self, weighting=weighting)
 
 
+def _find_matches(
+    ac: AhoCorasickBase,
+    items: Iterable[tuple[str, str]],
+    is_prefix: bytes | None = None,
+) -> tuple[list[str], list[str], list[int], list[int]]:
+    """Search (protein_id, sequence) pairs; return peptide, protein, start, end columns.
+
+    If ``is_prefix`` (a :func:`_residue_table`) is given, only tryptic matches
+    are kept, with the same rules as :meth:`AnnotationResult.filter_tryptic`.
+    """
+    match_peptides, match_proteins, starts, ends = [], [], [], []
+    for protein_id, sequence in items:
+        encoded = None
+        for match in ac.find_all(sequence):
+            start = match.start
+            if is_prefix is not None and start:
+                if encoded is None:
+                    encoded = sequence.encode("ascii", "replace")
+                if not (
+                    is_prefix[encoded[start - 1]] or (start == 1 and encoded[0] == _MET)
+                ):
+                    continue
+            match_peptides.append(match.keyword)
+            match_proteins.append(protein_id)
+            starts.append(start)
+            ends.append(match.end)
+    return match_peptides, match_proteins, starts, ends
+
+
 def annotate_peptides(
     peptides: Iterable[str],
     proteins: dict[str, str],
@@ -135,7 +263,8 @@ def annotate_peptides(
     Args:
         peptides: Iterable of peptide sequences to search for
         proteins: Dict mapping protein_id to protein sequence
-        backend: Aho-Corasick backend ("auto", "ahocorapy", "ahocorasick_rs")
+        backend: Aho-Corasick backend ("auto", "ahocorapy", "ahocorasick_rs");
+            "auto" searches up to 8 peptides with str.find instead
         filter_tryptic: If True, only keep tryptic peptides (preceded by R/K or at N-term)
 
     Returns:
@@ -155,36 +284,44 @@ def annotate_peptides(
     """
     peptide_list = list(set(peptides))  # Deduplicate
 
-    if not peptide_list:
-        return AnnotationResult(annotations=[])
-
-    # Build automaton from peptides
-    ac = create_automaton(peptide_list, backend=backend)
-
-    # Search each protein
-    annotations = []
-    for protein_id, sequence in proteins.items():
-        for match in ac.find_all(sequence):
-            annotations.append(
-                PeptideAnnotation(
-                    peptide=match.keyword,
-                    protein_id=protein_id,
-                    start=match.start,
-                    end=match.end,
-                )
-            )
-
-    result = AnnotationResult(annotations=annotations)
-
-    if filter_tryptic:
-        result = result.filter_tryptic(proteins)
-
-    return result
+    if not peptide_list or not proteins:
+        return AnnotationResult()
+
+    # Build automaton from peptides; for a few peptides plain str.find is
+    # cheaper than building the automaton
+    if backend == "auto" and len(peptide_list) <= _STR_FIND_MAX_PEPTIDES:
+        ac = StrFindSearch(peptide_list)
+    else:
+        ac = create_automaton(peptide_list, backend=backend)
+
+    # Search each protein, collecting matches column-wise. Backends that
+    # release the GIL search protein chunks on a thread pool; chunks are
+    # concatenated in order, so the result is the same as the serial search.
+    items = list(proteins.items())
+    find = partial(
+        _find_matches, ac, is_prefix=_residue_table("RK") if filter_tryptic else None
+    )
+    workers = os.cpu_count() or 1
+    if ac.releases_gil and workers > 1 and len(items) >= _PARALLEL_MIN_PROTEINS:
+        size = -(-len(items) // workers)
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(find, chunks))
+    else:
+        parts = [find(items)]
+
+    return AnnotationResult.from_columns(
+        *(list(chain.from_iterable(column)) for column in zip(*parts))
+    )
 
 
 def read_fasta(filepath: str) -> dict[str, str]:
     """Read a FASTA file into a dict of protein_id -> sequence.
 
+    The file is read in binary chunks and split on record boundaries
+    (``b"\\n>"``), so each protein costs one header split and one decode
+    rather than a strip/append per sequence line.
+
     Args:
         filepath: Path to FASTA file (can be gzipped)
 
@@ -195,26 +332,25 @@ def read_fasta(filepath: str) -> dict[str, str]:
     from pathlib import Path
 
     proteins = {}
-    current_id = None
-    current_seq = []
-
     path = Path(filepath)
     opener = gzip.open if path.suffix == ".gz" else open
 
-    with opener(path, "rt") as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith(">"):
-                if current_id is not None:
-                    proteins[current_id] = "".join(current_seq)
-                # Extract ID from header (first word after >)
-                current_id = line[1:].split()[0]
-                current_seq = []
-            else:
-                current_seq.append(line)
-
-        # Don't forget last sequence
-        if current_id is not None:
-            proteins[current_id] = "".join(current_seq)
+    def add_record(record: bytes) -> None:
+        header, _, seq = record.partition(b"\n")
+        # Extract ID from header (first word after >)
+        proteins[header.split()[0].decode()] = seq.translate(None, b" \t\r\n").decode()
+
+    preamble = True
+    with opener(path, "rb") as f:
+        buf = b"\n"  # so a header on the first line splits like all others
+        while chunk := f.read(_FASTA_CHUNK_SIZE):
+            *records, buf = (buf + chunk).split(b"\n>")
+            if preamble and records:
+                records = records[1:]  # text before the first header
+                preamble = False
+            for record in records:
+                add_record(record)
+    if not preamble:
+        add_record(buf)
 
     return proteins
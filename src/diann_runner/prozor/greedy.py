@@ -112,6 +112,16 @@ class GreedyResult:
         return pd.DataFrame(rows)
 
 
+def _gather(
+    indptr: np.ndarray, indices: np.ndarray, positions: np.ndarray
+) -> np.ndarray:
+    """Concatenate ``indices[indptr[p]:indptr[p + 1]]`` for each p in positions."""
+    starts = indptr[positions]
+    lengths = indptr[positions + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return indices[offsets + np.arange(offsets.size)]
+
+
 def greedy_parsimony(
     pep_prot: PeptideProteinMatrix,
     subsume: bool = True,
@@ -140,102 +150,81 @@ def greedy_parsimony(
         >>> inference = greedy_parsimony(matrix)
         >>> print(f"Reduced to {inference.n_groups} protein groups")
     """
-    # Convert to LIL for efficient row access, then to CSC for column sums
-    matrix = pep_prot.matrix.tocsc().astype(np.float64)
-    n_peptides, n_proteins = matrix.shape
-
-    # Build peptide->protein lookup using sparse structure for efficiency
-    # peptide_proteins[i] = set of protein indices that contain peptide i
-    matrix_csr = matrix.tocsr()
-    peptide_proteins = []
-    for i in range(n_peptides):
-        row = matrix_csr.getrow(i)
-        peptide_proteins.append(set(row.indices))
-
-    # Build protein->peptide lookup
-    # protein_peptides[j] = set of peptide indices that protein j contains
-    protein_peptides = []
-    for j in range(n_proteins):
-        col = matrix.getcol(j)
-        protein_peptides.append(set(col.indices))
-
-    # Track which peptides/proteins are still active (as sets for O(1) operations)
-    active_peptides = set(range(n_peptides))
-    active_proteins = set(range(n_proteins))
-
-    # Compute initial peptide counts per protein
-    pep_counts = np.array([len(protein_peptides[j]) for j in range(n_proteins)])
+    # Only the sparsity structure is used, so the values are never cast.
+    # tocsr() is a no-op for the usual CSR input; tocsc() yields sorted indices.
+    matrix_csr = pep_prot.matrix.tocsr()
+    matrix_csc = matrix_csr.tocsc()
+    matrix_csc.sort_indices()
+    n_peptides, n_proteins = matrix_csr.shape
 
-    groups = []
+    # Peptides of protein j: csc_indices[csc_indptr[j]:csc_indptr[j + 1]]
+    csc_indptr, csc_indices = matrix_csc.indptr, matrix_csc.indices
+    # Proteins of peptide i: csr_indices[csr_indptr[i]:csr_indptr[i + 1]]
+    csr_indptr, csr_indices = matrix_csr.indptr, matrix_csr.indices
 
-    while active_peptides and active_proteins:
-        # Find protein(s) with most active peptides
-        # Only consider active proteins
-        active_prot_list = np.array(list(active_proteins))
-        if len(active_prot_list) == 0:
-            break
+    # Track which peptides/proteins are still active
+    peptide_active = np.ones(n_peptides, dtype=bool)
+    protein_active = np.ones(n_proteins, dtype=bool)
+
+    # Number of active peptides per protein
+    pep_counts = np.diff(csc_indptr).astype(np.int32)
 
-        active_counts = pep_counts[active_prot_list]
-        max_count = active_counts.max()
+    groups = []
+
+    while n_proteins:
+        # Find protein(s) with most active peptides among active proteins
+        masked = np.where(protein_active, pep_counts, np.int32(-1))
+        max_count = masked.max()
 
-        if max_count == 0:
+        if max_count <= 0:
             break
 
         # Find all proteins tied for max count
-        candidates = active_prot_list[active_counts == max_count]
-
-        # Group indistinguishable proteins (same peptide sets among active peptides)
-        # Use frozenset of active peptides for each candidate
-        peptide_signatures = {}
-        for prot_idx in candidates:
-            # Get active peptides for this protein
-            active_peps = protein_peptides[prot_idx] & active_peptides
-            sig = frozenset(active_peps)
-            if sig not in peptide_signatures:
-                peptide_signatures[sig] = []
-            peptide_signatures[sig].append(prot_idx)
+        candidates = np.flatnonzero(masked == max_count)
+
+        # Group indistinguishable proteins (same peptide sets among active
+        # peptides). Every candidate has exactly max_count active peptides,
+        # so the sorted signatures form one row each of a 2-D array.
+        rows = _gather(csc_indptr, csc_indices, candidates)
+        signatures = rows[peptide_active[rows]].reshape(len(candidates), max_count)
+        _, first, inverse, sizes = np.unique(
+            signatures,
+            axis=0,
+            return_index=True,
+            return_inverse=True,
+            return_counts=True,
+        )
 
         # Pick the largest group (or first if tied)
-        best_group = max(peptide_signatures.values(), key=len)
+        largest = sizes == sizes.max()
+        best = np.flatnonzero(largest)[np.argmin(first[largest])]
+        best_group = candidates[inverse == best].tolist()
 
         # Get peptides covered by this group (all have same peptides)
-        covered_peptides = protein_peptides[best_group[0]] & active_peptides
-        group_peptides = [pep_prot.peptides[i] for i in covered_peptides]
-
-        # Find subsumed proteins: proteins whose remaining peptides are
-        # a subset of the winner's peptides (they become "empty" after this round)
+        covered_peptides = signatures[first[best]]
+        group_peptides = [pep_prot.peptides[i] for i in covered_peptides.tolist()]
+
+        # Remove the covered peptides and the winners, then decrement the
+        # counts of every protein sharing one of the covered peptides
+        peptide_active[covered_peptides] = False
+        protein_active[best_group] = False
+        sharing = _gather(csr_indptr, csr_indices, covered_peptides)
+        np.add.at(pep_counts, sharing, -1)
+
+        # Find subsumed proteins: proteins sharing a covered peptide whose
+        # remaining peptides were all covered by the winner (they are now empty)
         subsumed_proteins = []
         if subsume:
-            # Only check proteins that share at least one peptide with winner
-            # Build set of proteins that share peptides with winner
-            candidate_subsumed = set()
-            for pep_idx in covered_peptides:
-                candidate_subsumed.update(peptide_proteins[pep_idx])
-            candidate_subsumed -= set(best_group)
-            candidate_subsumed &= active_proteins
-
-            for prot_idx in candidate_subsumed:
-                prot_active_peps = protein_peptides[prot_idx] & active_peptides
-                if prot_active_peps <= covered_peptides:
-                    # This protein's peptides are a subset of winner's
-                    subsumed_proteins.append(prot_idx)
+            sharing = np.unique(sharing)
+            subsumed = sharing[protein_active[sharing] & (pep_counts[sharing] == 0)]
+            protein_active[subsumed] = False
+            subsumed_proteins = subsumed.tolist()
 
         # Get protein names for this group (winners + subsumed)
-        all_group_indices = list(best_group) + subsumed_proteins
+        all_group_indices = best_group + subsumed_proteins
         group_proteins = [pep_prot.proteins[i] for i in all_group_indices]
 
         # Create protein group
         groups.append(ProteinGroup(proteins=group_proteins, peptides=group_peptides))
 
-        # Update active sets
-        active_peptides -= covered_peptides
-        active_proteins -= set(all_group_indices)
-
-        # Update peptide counts for remaining proteins
-        # Subtract counts for removed peptides
-        for pep_idx in covered_peptides:
-            for prot_idx in peptide_proteins[pep_idx]:
-                if prot_idx in active_proteins:
-                    pep_counts[prot_idx] -= 1
-
     return GreedyResult(groups=groups)
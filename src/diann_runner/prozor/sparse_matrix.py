@@ -6,6 +6,7 @@ binary (or weighted) matrix used for protein inference.
 """
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -51,22 +52,48 @@ class PeptideProteinMatrix:
         """Fraction of non-zero entries."""
         return self.matrix.nnz / (self.matrix.shape[0] * self.matrix.shape[1])
 
+    # The matrix is not modified after construction, so the per-row and
+    # per-column entry counts are computed once. They stay private (and
+    # read-only); the public methods below hand out copies.
+    @cached_property
+    def _col_nnz(self) -> np.ndarray:
+        csr = self.matrix.tocsr()
+        counts = np.bincount(csr.indices, minlength=csr.shape[1])
+        counts.setflags(write=False)
+        return counts
+
+    @cached_property
+    def _row_nnz(self) -> np.ndarray:
+        counts = np.diff(self.matrix.tocsr().indptr)
+        counts.setflags(write=False)
+        return counts
+
     def peptides_per_protein(self) -> np.ndarray:
-        """Number of peptides matching each protein."""
-        return np.asarray(self.matrix.sum(axis=0)).ravel()
+        """Number of peptides matching each protein.
+
+        Counts the stored entries of each column (an integer array), so an
+        inverse-weighted matrix gives the number of matches, not the sum of
+        the weights. Returns a new array on every call.
+        """
+        return self._col_nnz.copy()
 
     def proteins_per_peptide(self) -> np.ndarray:
-        """Number of proteins matching each peptide."""
-        return np.asarray(self.matrix.sum(axis=1)).ravel()
+        """Number of proteins matching each peptide.
+
+        Counts the stored entries of each row (an integer array), so an
+        inverse-weighted matrix gives the number of matches, not the sum of
+        the weights. Returns a new array on every call.
+        """
+        return self._row_nnz.copy()
 
     def proteotypic_peptides(self) -> list[str]:
         """Return peptides that match exactly one protein."""
-        counts = self.proteins_per_peptide()
+        counts = self._row_nnz
         return [pep for pep, count in zip(self.peptides, counts) if count == 1]
 
     def proteotypic_fraction(self) -> float:
         """Fraction of peptides that are proteotypic (match 1 protein)."""
-        counts = self.proteins_per_peptide()
+        counts = self._row_nnz
         return np.sum(counts == 1) / len(counts) if len(counts) > 0 else 0.0
 
     @classmethod
@@ -87,38 +114,35 @@ class PeptideProteinMatrix:
         Returns:
             PeptideProteinMatrix
         """
-        # Build peptide and protein indices
-        peptide_set = sorted(annotations.peptides)
-        protein_set = sorted(annotations.proteins)
-
-        peptide_to_idx = {p: i for i, p in enumerate(peptide_set)}
-        protein_to_idx = {p: i for i, p in enumerate(protein_set)}
-
-        # Build COO format arrays
-        rows = []
-        cols = []
-        for ann in annotations:
-            rows.append(peptide_to_idx[ann.peptide])
-            cols.append(protein_to_idx[ann.protein_id])
-
-        # Create sparse matrix
-        data = np.ones(len(rows), dtype=np.float64)
+        import pandas as pd
+
+        # Build COO format arrays: sorted codes of each annotation's peptide
+        # and protein give the row and column indices
+        rows, peptide_set = pd.factorize(annotations.peptides_arr, sort=True)
+        cols, protein_set = pd.factorize(annotations.protein_ids_arr, sort=True)
+        peptide_set = peptide_set.tolist()
+        protein_set = protein_set.tolist()
+
+        # Ensure binary: deduplicate multiple matches of the same peptide to
+        # the same protein on a packed (row, col) key before building the matrix
+        n_cols = max(len(protein_set), 1)
+        rows, cols = np.divmod(np.unique(rows.astype(np.int64) * n_cols + cols), n_cols)
+
+        # Create sparse matrix (int8: entries are 0/1 unless weighted below)
+        data = np.ones(len(rows), dtype=np.int8)
         matrix = sparse.csr_matrix(
             (data, (rows, cols)),
             shape=(len(peptide_set), len(protein_set)),
         )
 
-        # Ensure binary (deduplicate multiple matches of same peptide to same protein)
-        matrix.data = np.ones_like(matrix.data)
-
         # Apply weighting
         if weighting == "inverse":
-            # Weight each peptide by 1/(number of proteins it matches)
-            proteins_per_pep = np.asarray(matrix.sum(axis=1)).ravel()
-            # Avoid division by zero
-            proteins_per_pep[proteins_per_pep == 0] = 1
-            # Divide each row by its sum
-            matrix = sparse.diags(1.0 / proteins_per_pep) @ matrix
+            # Weight each peptide by 1/(number of proteins it matches): the
+            # entries are ones, so every entry of a row is set to 1/row length
+            proteins_per_pep = np.diff(matrix.indptr)
+            # Avoid division by zero (empty rows get no entries anyway)
+            weights = 1.0 / np.maximum(proteins_per_pep, 1)
+            matrix.data = np.repeat(weights, proteins_per_pep)
 
         return cls(matrix=matrix, peptides=peptide_set, proteins=protein_set)
 
@@ -142,27 +166,27 @@ class PeptideProteinMatrix:
         Returns:
             PeptideProteinMatrix
         """
-        # Build peptide and protein indices
-        peptide_set = sorted(df[peptide_col].unique())
-        protein_set = sorted(df[protein_col].unique())
+        import pandas as pd
 
-        peptide_to_idx = {p: i for i, p in enumerate(peptide_set)}
-        protein_to_idx = {p: i for i, p in enumerate(protein_set)}
+        # Sorted codes give the row and column indices
+        rows, peptide_set = pd.factorize(df[peptide_col], sort=True)
+        cols, protein_set = pd.factorize(df[protein_col], sort=True)
+        peptide_set = peptide_set.tolist()
+        protein_set = protein_set.tolist()
 
-        rows = df[peptide_col].map(peptide_to_idx).values
-        cols = df[protein_col].map(protein_to_idx).values
+        n_cols = max(len(protein_set), 1)
+        rows, cols = np.divmod(np.unique(rows.astype(np.int64) * n_cols + cols), n_cols)
 
-        data = np.ones(len(rows), dtype=np.float64)
+        data = np.ones(len(rows), dtype=np.int8)
         matrix = sparse.csr_matrix(
             (data, (rows, cols)),
             shape=(len(peptide_set), len(protein_set)),
         )
-        matrix.data = np.ones_like(matrix.data)
 
         if weighting == "inverse":
-            proteins_per_pep = np.asarray(matrix.sum(axis=1)).ravel()
-            proteins_per_pep[proteins_per_pep == 0] = 1
-            matrix = sparse.diags(1.0 / proteins_per_pep) @ matrix
+            proteins_per_pep = np.diff(matrix.indptr)
+            weights = 1.0 / np.maximum(proteins_per_pep, 1)
+            matrix.data = np.repeat(weights, proteins_per_pep)
 
         return cls(matrix=matrix, peptides=peptide_set, proteins=protein_set)
 
@@ -188,14 +212,12 @@ class PeptideProteinMatrix:
 
     def remove_zero_rows(self) -> "PeptideProteinMatrix":
         """Remove peptide rows with no protein matches."""
-        row_sums = np.asarray(self.matrix.sum(axis=1)).ravel()
-        nonzero_mask = row_sums > 0
+        nonzero_mask = self._row_nnz > 0
         nonzero_indices = np.where(nonzero_mask)[0]
         return self.subset_peptides(nonzero_indices)
 
     def remove_zero_cols(self) -> "PeptideProteinMatrix":
         """Remove protein columns with no peptide matches."""
-        col_sums = np.asarray(self.matrix.sum(axis=0)).ravel()
-        nonzero_mask = col_sums > 0
+        nonzero_mask = self._col_nnz > 0
         nonzero_indices = np.where(nonzero_mask)[0]
         return self.subset_proteins(nonzero_indices)
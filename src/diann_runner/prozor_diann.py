@@ -11,9 +11,11 @@ This tool:
 
 from collections.abc import Iterable
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
 
 import cyclopts
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -27,15 +29,6 @@ app = cyclopts.App(
 )
 
 
-@dataclass
-class PeptideMappings:
-    """Mappings from peptides to protein group information."""
-
-    protein_ids: dict[str, str]  # peptide -> semicolon-joined protein IDs
-    protein_group: dict[str, str]  # peptide -> representative protein
-    n_peptides: dict[str, int]  # peptide -> number of peptides in group
-
-
 @dataclass
 class InferenceStats:
     """Statistics from protein inference."""
@@ -100,10 +93,10 @@ def _load_report(report_path: Path) -> pd.DataFrame:
 
 def _extract_peptides(df: pd.DataFrame, min_length: int) -> list[str]:
     """Extract unique peptides from report, filtered by length."""
-    peptides = df["Stripped.Sequence"].unique().tolist()
+    peptides = pd.Series(df["Stripped.Sequence"].unique())
     logger.info(f"Unique peptides: {len(peptides)}")
 
-    peptides = [p for p in peptides if len(p) >= min_length]
+    peptides = peptides[peptides.str.len() >= min_length].tolist()
     logger.info(f"Peptides after length filter (>={min_length}): {len(peptides)}")
     return peptides
 
@@ -177,33 +170,35 @@ def _run_parsimony(matrix: PeptideProteinMatrix) -> GreedyResult:
     return protein_groups
 
 
-def _build_peptide_mappings(protein_groups: GreedyResult) -> PeptideMappings:
-    """Build peptide to protein group mappings."""
-    peptide_to_proteins: dict[str, set[str]] = {}
-    peptide_to_group: dict[str, str] = {}
-    peptide_to_n_peptides: dict[str, int] = {}
+def _build_peptide_mappings(protein_groups: GreedyResult) -> pd.DataFrame:
+    """Build peptide to protein group mappings.
 
-    for group in protein_groups:
-        representative = group.proteins[0]
-        n_peptides_in_group = group.n_peptides
-
-        for peptide in group.peptides:
-            if peptide not in peptide_to_proteins:
-                peptide_to_proteins[peptide] = set()
-                peptide_to_group[peptide] = representative
-                peptide_to_n_peptides[peptide] = n_peptides_in_group
-            peptide_to_proteins[peptide].update(group.proteins)
-
-    protein_ids = {pep: ";".join(sorted(prots)) for pep, prots in peptide_to_proteins.items()}
-
-    return PeptideMappings(
-        protein_ids=protein_ids,
-        protein_group=peptide_to_group,
-        n_peptides=peptide_to_n_peptides,
+    Returns a table indexed by peptide with the report columns it fills:
+    Protein.Ids (semicolon-joined protein IDs), Protein.Group (representative
+    protein) and PG.N.Peptides (number of peptides in the group).
+    """
+    # Parsimony assigns every peptide to exactly one group, so each group's
+    # values are simply repeated once per peptide of the group
+    groups = protein_groups.groups
+    sizes = [group.n_peptides for group in groups]
+
+    def per_peptide(values: list) -> np.ndarray:
+        return np.repeat(np.array(values, dtype=object), sizes)
+
+    return pd.DataFrame(
+        {
+            "Protein.Ids": per_peptide([";".join(sorted(group.proteins)) for group in groups]),
+            "Protein.Group": per_peptide([group.proteins[0] for group in groups]),
+            "PG.N.Peptides": np.repeat(np.array(sizes, dtype=np.int64), sizes),
+        },
+        index=pd.Index(
+            list(chain.from_iterable(group.peptides for group in groups)),
+            name="Stripped.Sequence",
+        ),
     )
 
 
-def _apply_mappings(df: pd.DataFrame, mappings: PeptideMappings) -> pd.DataFrame:
+def _apply_mappings(df: pd.DataFrame, mappings: pd.DataFrame) -> pd.DataFrame:
     """Apply peptide mappings to update protein columns in DataFrame."""
     logger.info("Updating protein columns...")
 
@@ -211,10 +206,12 @@ def _apply_mappings(df: pd.DataFrame, mappings: PeptideMappings) -> pd.DataFrame
     df["Protein.Ids.Original"] = df["Protein.Ids"]
     df["Protein.Group.Original"] = df["Protein.Group"]
 
-    # Apply new mappings
-    df["Protein.Ids"] = df["Stripped.Sequence"].map(mappings.protein_ids)
-    df["Protein.Group"] = df["Stripped.Sequence"].map(mappings.protein_group)
-    df["PG.N.Peptides"] = df["Stripped.Sequence"].map(mappings.n_peptides)
+    # Apply new mappings: look up each distinct peptide once, then spread
+    # the mapped values to the rows through their integer codes
+    codes, peptides = pd.factorize(df["Stripped.Sequence"], use_na_sentinel=False)
+    mapped = mappings.reindex(peptides)
+    for column in mappings.columns:
+        df[column] = mapped[column].to_numpy()[codes]
 
     # Check for unmapped peptides - indicates FASTA mismatch
     unmapped_mask = df["Protein.Ids"].isna()
@@ -253,7 +250,7 @@ def _collect_stats(
         total_rows=len(df),
         unique_peptides=len(peptides),
         proteins_in_fasta=len(proteins),
-        peptide_protein_matches=sum(1 for _ in matrix.matrix.data),
+        peptide_protein_matches=int(matrix.matrix.nnz),
         proteins_matched=n_prots,
         proteotypic_peptides=n_proteotypic,
         proteotypic_fraction=matrix.proteotypic_fraction(),
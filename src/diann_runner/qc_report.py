@@ -6,7 +6,6 @@ Generates comprehensive QC reports by:
 3. Optionally rendering to PDF using Pandoc + LaTeX
 """
 
-import re
 import shutil
 import subprocess
 from datetime import datetime
@@ -15,18 +14,20 @@ from typing import Annotated
 
 import cyclopts
 import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
-from scipy.stats import variation
 
 from diann_runner.report_figures import (
+    build_quant_matrices,
+    compute_cv_stats,
     create_consistency_histograms,
     create_correlation_matrix,
     create_cv_analysis_plots,
     create_rt_heatmaps,
     create_run_statistics_plots,
+    read_report_parquet,
     remove_common,
     save_figure,
+    split_replicate_condition,
 )
 
 app = cyclopts.App(
@@ -52,39 +53,6 @@ def _normalize_file_column(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _compute_cv_stats(
-    df: pd.DataFrame,
-    matrix: pd.DataFrame,
-    condition: str,
-    files: pd.Series,
-    prefix: str,
-) -> None:
-    """Compute CV statistics for a given matrix and update the stats DataFrame.
-
-    Args:
-        df: Stats DataFrame to update (modified in-place).
-        matrix: Pivot table (precursors, protein groups, or genes).
-        condition: Condition name to filter by.
-        files: File names belonging to this condition.
-        prefix: Column prefix ("Precursor", "PG", or "Gene").
-    """
-    matching_cols = [c for c in matrix.columns if c in list(files)]
-    if len(matching_cols) == 0:
-        return
-
-    cvs = np.ma.filled(
-        variation(matrix[files], axis=1, nan_policy="omit"), float("nan")
-    )
-    cvs[cvs == 0] = float("nan")
-
-    df.loc[df["Condition"] == condition, f"{prefix}.CV"] = np.nanmedian(cvs)
-    df.loc[df["Condition"] == condition, f"{prefix}.CV.20"] = len(cvs[cvs <= 0.2])
-    df.loc[df["Condition"] == condition, f"{prefix}.CV.10"] = len(cvs[cvs <= 0.1])
-    df.loc[df["Condition"] == condition, f"{prefix}.N"] = np.mean(
-        matrix[files].count()
-    ).astype(int)
-
-
 def _load_report_data(stats: Path, main: Path) -> tuple[
     pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame
 ]:
@@ -101,47 +69,13 @@ def _load_report_data(stats: Path, main: Path) -> tuple[
     df.loc[:, "File.Name"] = remove_common(df["File.Name"])
 
     if str(main).endswith(".parquet"):
-        quant = pd.read_parquet(main)
+        quant = read_report_parquet(main)
         quant = _normalize_file_column(quant)
     else:
         quant = pd.read_csv(main, sep="\t")
     quant = quant[quant["Q.Value"] <= 0.01].reset_index(drop=True)
     quant.loc[:, "File.Name"] = remove_common(quant["File.Name"])
-
-    quant_pg = (
-        quant[quant["PG.Q.Value"] <= 0.01][["File.Name", "Protein.Group", "PG.MaxLFQ"]]
-        .drop_duplicates()
-        .reset_index(drop=True)
-    )
-    quant_gene = (
-        quant[quant["GG.Q.Value"] <= 0.01][["File.Name", "Genes", "Genes.MaxLFQ"]]
-        .drop_duplicates()
-        .reset_index(drop=True)
-    )
-
-    pr = quant.pivot_table(
-        values=["Precursor.Normalised"],
-        columns=["File.Name"],
-        index=["Precursor.Id"],
-        aggfunc="sum",
-    )
-    pg = quant_pg.pivot_table(
-        values=["PG.MaxLFQ"],
-        columns=["File.Name"],
-        index=["Protein.Group"],
-        aggfunc="sum",
-    )
-    genes = quant_gene.pivot_table(
-        values=["Genes.MaxLFQ"],
-        columns=["File.Name"],
-        index=["Genes"],
-        aggfunc="sum",
-    )
-    pr.columns, pg.columns, genes.columns = (
-        pr.columns.droplevel(),
-        pg.columns.droplevel(),
-        genes.columns.droplevel(),
-    )
+    pr, pg, genes = build_quant_matrices(quant)
 
     return df, quant, pr, pg, genes
 
@@ -161,25 +95,9 @@ def _compute_conditions_and_cvs(
         True if conditions were successfully computed, False otherwise.
     """
     try:
-        df["Replicate"] = [re.findall(r"\d+", file)[-1] for file in df["File.Name"]]
-        df["Condition"] = [
-            file[: file.rfind(re.findall(r"\d+", file)[-1])]
-            + file[
-                file.rfind(re.findall(r"\d+", file)[-1])
-                + len(re.findall(r"\d+", file)[-1]) :
-            ]
-            for file in df["File.Name"]
-        ]
-        conditions = df["Condition"].unique()
-        for col in ["Precursor.CV", "Precursor.CV.20", "Precursor.CV.10", "Precursor.N",
-                    "PG.CV", "PG.CV.20", "PG.CV.10", "PG.N",
-                    "Gene.CV", "Gene.CV.20", "Gene.CV.10", "Gene.N"]:
-            df[col] = 0
-        for condition in conditions:
-            files = df["File.Name"][df["Condition"] == condition]
-            _compute_cv_stats(df, pr, condition, files, "Precursor")
-            _compute_cv_stats(df, pg, condition, files, "PG")
-            _compute_cv_stats(df, genes, condition, files, "Gene")
+        df["Replicate"], df["Condition"] = split_replicate_condition(df["File.Name"])
+        for matrix, prefix in ((pr, "Precursor"), (pg, "PG"), (genes, "Gene")):
+            compute_cv_stats(df, matrix, prefix)
         return True
     except (KeyError, IndexError, ValueError) as e:
         print(f"Cannot infer conditions/replicates: {e}")
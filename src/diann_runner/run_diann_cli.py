@@ -19,16 +19,18 @@ low-level passthrough for developers.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 import cyclopts
 import yaml
 from loguru import logger
 
-from diann_runner import prepare
-from diann_runner.request import DIANNRunnerParams, DiannRunRequest
-from diann_runner.snakemake_helpers import parse_flat_params
-from diann_runner.sushi_adapter import parse_sushi_dataset, parse_sushi_params
+if TYPE_CHECKING:
+    from diann_runner.request import DiannRunRequest
+
+# The runner modules (prepare, request, sushi_adapter) pull in pandas and
+# pydantic; they are imported inside the commands so ``run-diann --help`` and
+# argument errors return without paying that start-up cost.
 
 app = cyclopts.App(
     name="run-diann",
@@ -113,6 +115,8 @@ def _build_request(
     register_outputs: bool,
     runtime: str | None = None,
 ) -> DiannRunRequest:
+    from diann_runner.request import DIANNRunnerParams, DiannRunRequest
+
     database_fasta = _apply_fasta(workflow_params, fastas, work_dir)
     return DiannRunRequest(
         params=DIANNRunnerParams.from_parsed(workflow_params),
@@ -153,6 +157,9 @@ def apprunner(
     instead (e.g. on a host with apptainer installed but no SIF cache, so the
     built docker images are used).
     """
+    from diann_runner import prepare
+    from diann_runner.snakemake_helpers import parse_flat_params
+
     params = _under(work_dir, params)
     dataset = _under(work_dir, dataset)
     raw_dir = _under(work_dir, raw_dir)
@@ -205,6 +212,9 @@ def sushi(
 
     Outputs are not registered in B-Fabric (the EzPyz wrapper delivers them).
     """
+    from diann_runner import prepare
+    from diann_runner.sushi_adapter import parse_sushi_dataset, parse_sushi_params
+
     workflow_params, fasta_paths, params_data_root = parse_sushi_params(params)
     effective_data_root = data_root if data_root is not None else params_data_root
     normalized, derived_raw_dir = parse_sushi_dataset(dataset, data_root=effective_data_root)
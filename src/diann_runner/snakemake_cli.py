@@ -8,6 +8,7 @@ Usage:
     diann-snakemake --cores 8 all  # run in current directory
 """
 
+import functools
 import os
 import subprocess
 import sys
@@ -16,9 +17,12 @@ from importlib.resources import files
 from loguru import logger
 
 
+@functools.lru_cache(maxsize=1)
 def get_snakefile_path() -> str:
     """Get the path to the bundled Snakefile.
 
+    The lookup is cached; the package location does not change within a process.
+
     Returns:
         Absolute path to Snakefile.DIANN3step.smk
     """
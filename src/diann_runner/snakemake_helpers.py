@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 import shlex
+import zipfile
 from html import escape
 from pathlib import Path
 
@@ -667,6 +668,165 @@ def write_result_index(
     Path(index_html).write_text("\n".join(html_lines), encoding="utf-8")
 
 
+def _iter_files(root: Path):
+    """Yield regular files below ``root`` (like ``rglob('*')`` + ``is_file()``).
+
+    Walks with ``os.scandir`` so the file/dir test uses the d_type the kernel
+    already returned with the directory listing instead of one ``stat`` per
+    entry. Symlinked directories are not descended into, matching ``rglob``.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield Path(entry.path)
+
+
+def _deflate_to_tempfile(
+    src_path: Path, tmp_dir: Path, compresslevel: int
+) -> tuple[Path, int, int, int]:
+    """Raw-DEFLATE ``src_path`` into a temp file next to the archive.
+
+    Streams the file in 1 MiB chunks, so memory stays flat regardless of the
+    input size. zlib releases the GIL while compressing, which is what lets
+    :func:`_write_zip_parallel` run these on a thread pool.
+
+    Returns:
+        ``(tmp_path, crc32, file_size, compress_size)``
+    """
+    import tempfile
+    import zlib
+
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc = 0
+    file_size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir, suffix=".deflate")
+    try:
+        with os.fdopen(fd, "wb") as dst, open(src_path, "rb") as src:
+            while chunk := src.read(1 << 20):
+                crc = zlib.crc32(chunk, crc)
+                file_size += len(chunk)
+                dst.write(compressor.compress(chunk))
+            dst.write(compressor.flush())
+            compress_size = dst.tell()
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return Path(tmp_name), crc, file_size, compress_size
+
+
+class _PrecompressedZipFile(zipfile.ZipFile):
+    """ZipFile that can also append entries whose data is already raw DEFLATE.
+
+    The public API compresses inside ``ZipFile.open(zinfo, "w")``, so
+    there is no documented way to store bytes deflated elsewhere. This
+    subclass keeps the needed ZipFile internals in one place. It mirrors
+    ``open(zinfo, "w")`` followed by ``close()`` of the returned writer:
+    seek to ``start_dir``, run ``_writecheck`` (mode check, duplicate-name
+    warning, ZIP64 limits), write the local header and data, then register
+    the entry for the central directory. The round trip is covered by
+    ``tests/test_snakemake_helpers.py`` on the supported Python versions.
+    """
+
+    def write_deflated(self, zinfo: zipfile.ZipInfo, data, zip64: bool) -> None:
+        """Append ``zinfo`` with raw-DEFLATE bytes read from the file object ``data``.
+
+        ``zinfo.CRC``, ``file_size`` and ``compress_size`` must already
+        describe the uncompressed and compressed data.
+        """
+        import shutil
+
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        with self._lock:
+            if self._writing:
+                raise ValueError(
+                    "Can't write to the ZIP file while there is another write handle open on it."
+                )
+            self.fp.seek(self.start_dir)
+            zinfo.header_offset = self.fp.tell()
+            self._writecheck(zinfo)
+            self._didModify = True
+            self.fp.write(zinfo.FileHeader(zip64))
+            shutil.copyfileobj(data, self.fp, 1 << 20)
+            self.start_dir = self.fp.tell()
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
+
+
+def _write_zip_parallel(
+    zip_path: str | Path,
+    entries: list[tuple[Path, str]],
+    compresslevel: int = 3,
+    max_workers: int | None = None,
+) -> None:
+    """Write ``(source, arcname)`` entries to a DEFLATE zip, compressing in parallel.
+
+    ``ZipFile.write`` compresses on the calling thread, one file at a time,
+    which leaves multi-GB DIA-NN outputs bound to a single core. Here files
+    are compressed concurrently into temp files, and the main thread only
+    appends the pre-deflated bytes as ZIP entries, in ``entries`` order.
+
+    At most ``2 * max_workers`` files are in flight (compressing or waiting
+    to be appended); the next file is submitted once one has been appended,
+    so the temp files next to the archive never add up to the whole output.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    from itertools import islice
+
+    zip_path = Path(zip_path)
+    tmp_dir = zip_path.resolve().parent
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    sources = iter(entries)
+    pending = deque()
+
+    def submit(n: int) -> None:
+        for src, arcname in islice(sources, n):
+            job = ex.submit(_deflate_to_tempfile, src, tmp_dir, compresslevel)
+            pending.append((src, arcname, job))
+
+    with _PrecompressedZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf, \
+            ThreadPoolExecutor(max_workers=max_workers) as ex:
+        try:
+            submit(2 * max_workers)
+            while pending:
+                src, arcname, job = pending.popleft()
+                _append_deflated_entry(zipf, src, arcname, job.result())
+                submit(1)
+        except BaseException:
+            # Don't leave finished-but-unconsumed temp files behind.
+            ex.shutdown(wait=True, cancel_futures=True)
+            for _, _, job in pending:
+                if job.done() and not job.cancelled() and job.exception() is None:
+                    job.result()[0].unlink(missing_ok=True)
+            raise
+
+
+def _append_deflated_entry(
+    zipf: _PrecompressedZipFile,
+    src: Path,
+    arcname: str,
+    deflated: tuple[Path, int, int, int],
+) -> None:
+    """Append one result of :func:`_deflate_to_tempfile` to ``zipf`` and remove its temp file."""
+    tmp_path, crc, file_size, compress_size = deflated
+    try:
+        zinfo = zipfile.ZipInfo.from_file(src, arcname)
+        zinfo.CRC = crc
+        zinfo.file_size = file_size
+        zinfo.compress_size = compress_size
+        zip64 = max(file_size, compress_size) > zipfile.ZIP64_LIMIT
+        with open(tmp_path, "rb") as data:
+            zipf.write_deflated(zinfo, data, zip64)
+    finally:
+        tmp_path.unlink()
+    print(f"  adding: {arcname}")
+
+
 def zip_diann_results(
     output_dir: str,
     zip_path: str,
@@ -682,45 +842,41 @@ def zip_diann_results(
         extra_files: Additional files to include at the archive root
         extra_dirs: Additional directories to include with their relative paths preserved
     """
-    import zipfile
-
     output_path = Path(output_dir)
     if not output_path.exists():
         raise FileNotFoundError(f"Output directory {output_dir} does not exist")
 
+    entries: list[tuple[Path, str]] = []
     written_arcnames = set()
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=3) as zipf:
-        # Add all files from the output directory, excluding library files
-        for file_path in output_path.rglob('*'):
-            if file_path.is_file() and 'report-lib.' not in file_path.name:
-                # Store with relative path from output directory
-                arcname = file_path.relative_to(output_path.parent)
-                zipf.write(file_path, arcname)
-                written_arcnames.add(str(arcname))
-                print(f"  adding: {arcname}")
-
-        for extra_file in extra_files or []:
-            extra_path = Path(extra_file)
-            if not extra_path.is_file():
-                raise FileNotFoundError(f"Extra file {extra_file} does not exist")
-            arcname = extra_path.name
+
+    # Add all files from the output directory, excluding library files
+    for file_path in _iter_files(output_path):
+        if 'report-lib.' not in file_path.name:
+            # Store with relative path from output directory
+            arcname = str(file_path.relative_to(output_path.parent))
+            entries.append((file_path, arcname))
+            written_arcnames.add(arcname)
+
+    for extra_file in extra_files or []:
+        extra_path = Path(extra_file)
+        if not extra_path.is_file():
+            raise FileNotFoundError(f"Extra file {extra_file} does not exist")
+        arcname = extra_path.name
+        if arcname not in written_arcnames:
+            entries.append((extra_path, arcname))
+            written_arcnames.add(arcname)
+
+    for extra_dir in extra_dirs or []:
+        extra_path = Path(extra_dir)
+        if not extra_path.is_dir():
+            raise FileNotFoundError(f"Extra directory {extra_dir} does not exist")
+        for file_path in _iter_files(extra_path):
+            arcname = str(file_path.relative_to(extra_path.parent))
             if arcname not in written_arcnames:
-                zipf.write(extra_path, arcname)
+                entries.append((file_path, arcname))
                 written_arcnames.add(arcname)
-                print(f"  adding: {arcname}")
-
-        for extra_dir in extra_dirs or []:
-            extra_path = Path(extra_dir)
-            if not extra_path.is_dir():
-                raise FileNotFoundError(f"Extra directory {extra_dir} does not exist")
-            for file_path in extra_path.rglob("*"):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(extra_path.parent)
-                    arcname_str = str(arcname)
-                    if arcname_str not in written_arcnames:
-                        zipf.write(file_path, arcname)
-                        written_arcnames.add(arcname_str)
-                        print(f"  adding: {arcname}")
+
+    _write_zip_parallel(zip_path, entries, compresslevel=3)
 
     print(f"Created {zip_path} with results from {output_dir}")
 
@@ -768,6 +924,29 @@ def copy_fasta_if_missing(output_dir: str, fasta_path: str | list[str]) -> str:
     return "\n".join(commands)
 
 
+# Oktoberfest settings that are not derived from the DIA-NN params; any key
+# given in ``oktoberfest_params`` overrides the value here.
+_OKTOBERFEST_DEFAULTS = {
+    "instrument_type": "QE",
+    "intensity_model": "Prosit_2023_intensity_timsTOF",
+    "irt_model": "Prosit_2019_irt",
+    "prediction_server": "koina.wilhelmlab.org:443",
+    "ssl": True,
+    "fragmentation": "HCD",
+    "collision_energy": 25,
+    "min_intensity": 0.0005,
+    "nr_ox": 1,
+    "batchsize": 10000,
+    "format": "msp",
+    "digestion": "full",
+    "enzyme": "trypsin",
+    "db": "concat",
+}
+
+# DIA-NN ``--cut`` rule ("K*,R*") -> Oktoberfest specialAas ("KR").
+_CUT_SITE_STRIP = str.maketrans("", "", "*,")
+
+
 def build_oktoberfest_config(
     workunit_id: str,
     fasta_path: str,
@@ -792,7 +971,7 @@ def build_oktoberfest_config(
     Returns:
         Dictionary containing Oktoberfest configuration
     """
-    oktoberfest_params = oktoberfest_params or {}
+    okt = {**_OKTOBERFEST_DEFAULTS, **(oktoberfest_params or {})}
 
     config = {
         "type": "SpectralLibraryGeneration",
@@ -800,42 +979,36 @@ def build_oktoberfest_config(
         "inputs": {
             "library_input": fasta_path,
             "library_input_type": "fasta",
-            "instrument_type": oktoberfest_params.get("instrument_type", "QE")
+            "instrument_type": okt["instrument_type"]
         },
         "output": output_dir,
         "models": {
-            "intensity": oktoberfest_params.get(
-                "intensity_model",
-                "Prosit_2023_intensity_timsTOF"
-            ),
-            "irt": oktoberfest_params.get("irt_model", "Prosit_2019_irt")
+            "intensity": okt["intensity_model"],
+            "irt": okt["irt_model"]
         },
-        "prediction_server": oktoberfest_params.get(
-            "prediction_server",
-            "koina.wilhelmlab.org:443"
-        ),
-        "ssl": oktoberfest_params.get("ssl", True),
+        "prediction_server": okt["prediction_server"],
+        "ssl": okt["ssl"],
         "spectralLibraryOptions": {
-            "fragmentation": oktoberfest_params.get("fragmentation", "HCD"),
-            "collisionEnergy": oktoberfest_params.get("collision_energy", 25),
+            "fragmentation": okt["fragmentation"],
+            "collisionEnergy": okt["collision_energy"],
             "precursorCharge": list(range(
                 diann_params["min_pr_charge"],
                 diann_params["max_pr_charge"] + 1
             )),
-            "minIntensity": oktoberfest_params.get("min_intensity", 0.0005),
-            "nrOx": oktoberfest_params.get("nr_ox", 1),
-            "batchsize": oktoberfest_params.get("batchsize", 10000),
-            "format": oktoberfest_params.get("format", "msp")
+            "minIntensity": okt["min_intensity"],
+            "nrOx": okt["nr_ox"],
+            "batchsize": okt["batchsize"],
+            "format": okt["format"]
         },
         "fastaDigestOptions": {
-            "fragmentation": oktoberfest_params.get("fragmentation", "HCD"),
-            "digestion": oktoberfest_params.get("digestion", "full"),
+            "fragmentation": okt["fragmentation"],
+            "digestion": okt["digestion"],
             "missedCleavages": diann_params["missed_cleavages"],
             "minLength": diann_params["min_pep_len"],
             "maxLength": diann_params["max_pep_len"],
-            "enzyme": oktoberfest_params.get("enzyme", "trypsin"),
-            "specialAas": diann_params["cut"].replace("*", "").replace(",", ""),
-            "db": oktoberfest_params.get("db", "concat")
+            "enzyme": okt["enzyme"],
+            "specialAas": diann_params["cut"].translate(_CUT_SITE_STRIP),
+            "db": okt["db"]
         }
     }
 
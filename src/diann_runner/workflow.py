@@ -832,21 +832,26 @@ class DiannWorkflow:
         # DIA-NN 2.3+ uses .parquet format
         refined_lib = f"{self.quant_b_dir}/{self.workunit_id}_refined.parquet"
 
-        print()
-        print("Generated scripts:")
-        print(f"  1. {scripts['step_a']} - Generate predicted library from FASTA")
-        print(f"  2. {scripts['step_b']} - {'Quantify + refine' if quantify_step_b else 'Build refined'} library ({len(raw_files_step_b)} files)")
-        print(f"  3. {scripts['step_c']} - Final quantification ({len(raw_files_step_c)} files)")
-        print()
-        print("Run them in order:")
-        for step in ['step_a', 'step_b', 'step_c']:
-            print(f"  bash {scripts[step]}")
-        print()
-        print("Key outputs (DIA-NN 2.3+ .parquet format):")
-        print(f"  - Predicted library: {predicted_lib}")
-        print(f"  - Refined library:   {refined_lib}")
-        print(f"  - Step B results:    {self.quant_b_dir}/{self.workunit_id}_report.parquet")
-        print(f"  - Final results:     {self.quant_c_dir}/{self.workunit_id}_report.parquet")
-        print(f"  - TSV matrices:      {self.quant_c_dir}/{self.workunit_id}_report.pg_matrix.tsv")
+        # One write so the summary stays contiguous when several Snakemake
+        # jobs share the terminal/log.
+        step_b_kind = 'Quantify + refine' if quantify_step_b else 'Build refined'
+        summary = [
+            "",
+            "Generated scripts:",
+            f"  1. {scripts['step_a']} - Generate predicted library from FASTA",
+            f"  2. {scripts['step_b']} - {step_b_kind} library ({len(raw_files_step_b)} files)",
+            f"  3. {scripts['step_c']} - Final quantification ({len(raw_files_step_c)} files)",
+            "",
+            "Run them in order:",
+            *(f"  bash {scripts[step]}" for step in ['step_a', 'step_b', 'step_c']),
+            "",
+            "Key outputs (DIA-NN 2.3+ .parquet format):",
+            f"  - Predicted library: {predicted_lib}",
+            f"  - Refined library:   {refined_lib}",
+            f"  - Step B results:    {self.quant_b_dir}/{self.workunit_id}_report.parquet",
+            f"  - Final results:     {self.quant_c_dir}/{self.workunit_id}_report.parquet",
+            f"  - TSV matrices:      {self.quant_c_dir}/{self.workunit_id}_report.pg_matrix.tsv",
+        ]
+        print("\n".join(summary))
         
         return scripts
@@ -0,0 +1,19 @@
+"""Tests for diann_runner.cleanup."""
+
+from diann_runner.cleanup import has_snakemake_locks
+
+
+def test_no_snakemake_dir_means_no_locks(tmp_path):
+    assert not has_snakemake_locks(tmp_path)
+
+
+def test_empty_locks_dir_means_no_locks(tmp_path):
+    (tmp_path / ".snakemake" / "locks").mkdir(parents=True)
+    assert not has_snakemake_locks(tmp_path)
+
+
+def test_lock_file_is_detected(tmp_path):
+    locks = tmp_path / ".snakemake" / "locks"
+    locks.mkdir(parents=True)
+    (locks / "0.input.lock").write_text("")
+    assert has_snakemake_locks(tmp_path)
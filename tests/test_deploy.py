@@ -0,0 +1,127 @@
+"""Tests for the deploy.smk helper module (``deploy.py`` at the repo root)."""
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+import deploy
+
+
+class TestRunProbes(unittest.TestCase):
+    def setUp(self):
+        deploy._probe.cache_clear()
+        self.addCleanup(deploy._probe.cache_clear)
+
+    def test_results_are_keyed_by_label_in_declared_order(self):
+        checks = [
+            ("second", [sys.executable, "-c", "print('b')"]),
+            ("first", [sys.executable, "-c", "print('a')"]),
+            ("failing", [sys.executable, "-c", "raise SystemExit(3)"]),
+        ]
+        results = deploy._run_probes(checks)
+
+        self.assertEqual(list(results), ["second", "first", "failing"])
+        self.assertEqual(results["second"].stdout.strip(), "b")
+        self.assertEqual(results["first"].stdout.strip(), "a")
+        self.assertEqual(results["failing"].returncode, 3)
+
+    def test_no_checks_returns_empty_dict(self):
+        self.assertEqual(deploy._run_probes([]), {})
+
+    @patch("deploy.subprocess.run")
+    def test_repeated_probes_share_one_subprocess(self, run):
+        run.return_value = subprocess.CompletedProcess([], 0, stdout="ok")
+
+        deploy._run_probes([("daemon", ["docker", "ps"])])
+        deploy._run_probes(
+            [("docker", ["docker", "ps"]), ("version", ["docker", "--version"])]
+        )
+
+        self.assertEqual(run.call_count, 2)
+
+
+class TestDockerImageCache(unittest.TestCase):
+    LISTING = (
+        "diann:2.3.2\t4.1GB (created 2 weeks ago)\n"
+        "oktoberfest:latest\t3.9GB (created 3 days ago)\n"
+        "ghcr.io/org/tool:1.0\t120MB (created 1 year ago)\n"
+    )
+
+    def setUp(self):
+        deploy._docker_images.cache_clear()
+        self.addCleanup(deploy._docker_images.cache_clear)
+
+    @patch("deploy.subprocess.run")
+    def test_single_docker_call_answers_all_queries(self, run):
+        run.return_value = subprocess.CompletedProcess([], 0, stdout=self.LISTING)
+
+        self.assertTrue(deploy.docker_image_exists("diann:2.3.2"))
+        self.assertTrue(deploy.docker_image_exists("oktoberfest"))
+        self.assertTrue(deploy.docker_image_exists("ghcr.io/org/tool:1.0"))
+        self.assertFalse(deploy.docker_image_exists("diann:2.5.1"))
+        self.assertFalse(deploy.docker_image_exists("ghcr.io/org/tool"))
+        self.assertEqual(
+            deploy._docker_images()["diann:2.3.2"], "4.1GB (created 2 weeks ago)"
+        )
+        run.assert_called_once()
+
+    @patch("deploy.load_diann_build_matrix", return_value=[{"tag": "oktoberfest"}])
+    @patch("deploy.subprocess.run")
+    def test_check_reports_untagged_image_details(self, run, _matrix):
+        run.return_value = subprocess.CompletedProcess([], 0, stdout=self.LISTING)
+
+        with patch("builtins.print") as out:
+            deploy.check_docker_images()
+
+        printed = [call.args[0] for call in out.call_args_list if call.args]
+        self.assertIn("✓ oktoberfest: 3.9GB (created 3 days ago)", printed)
+
+
+class TestImageLineFilter(unittest.TestCase):
+    def test_keeps_header_and_deployed_images_only(self):
+        listing = (
+            "REPOSITORY            TAG     SIZE\n"
+            "diann                 2.3.2   4.1GB\n"
+            "ubuntu                22.04   77MB\n"
+            "thermorawfileparser   2.0.0   900MB\n"
+        )
+        lines = [m.group(1) for m in deploy._IMAGE_LINE_RE.finditer(listing)]
+        self.assertEqual(
+            lines,
+            [
+                "REPOSITORY            TAG     SIZE",
+                "diann                 2.3.2   4.1GB",
+                "thermorawfileparser   2.0.0   900MB",
+            ],
+        )
+
+
+class TestDockerfileDigest(unittest.TestCase):
+    def test_digest_tracks_dockerfile_and_build_args(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            dockerfile = Path(tmp) / "Dockerfile"
+            dockerfile.write_text("FROM debian:bookworm\n")
+            base = deploy.dockerfile_digest(dockerfile, {"DIANN_VERSION": "2.3.2"})
+
+            self.assertEqual(
+                base, deploy.dockerfile_digest(dockerfile, {"DIANN_VERSION": "2.3.2"})
+            )
+            self.assertNotEqual(
+                base, deploy.dockerfile_digest(dockerfile, {"DIANN_VERSION": "2.5.1"})
+            )
+
+            dockerfile.write_text("FROM debian:trixie\n")
+            self.assertNotEqual(
+                base, deploy.dockerfile_digest(dockerfile, {"DIANN_VERSION": "2.3.2"})
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
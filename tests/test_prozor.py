@@ -10,6 +10,7 @@ from diann_runner.prozor import (
     ProteinGroup,
     annotate_peptides,
     greedy_parsimony,
+    read_fasta,
 )
 from diann_runner.prozor.ahocorasick import Match, create_automaton, get_available_backends
 from diann_runner.prozor_diann import run_prozor_inference
@@ -92,6 +93,15 @@ class TestAhoCorasick:
         keywords_found = {m.keyword for m in matches}
         assert keywords_found == {"PEPT", "TIDE", "SEQ"}
 
+    def test_str_find_search_matches_automaton(self):
+        """str.find search should find the same (overlapping) matches."""
+        from diann_runner.prozor.ahocorasick import StrFindSearch
+
+        keywords = ["AA", "PEPT", "TIDE"]
+        text = "AAAPEPTIDEAA"
+        expected = set(create_automaton(keywords, backend="ahocorapy").find_all(text))
+        assert set(StrFindSearch(keywords).find_all(text)) == expected
+
 
 class TestAnnotatePeptides:
     """Test peptide-protein annotation."""
@@ -155,6 +165,44 @@ class TestAnnotatePeptides:
         assert ann.end == 9
         assert ann.length == 4
 
+    def test_threaded_search_matches_serial(self, proteins, monkeypatch):
+        """Parallel protein search should return the serial result, in order."""
+        from diann_runner.prozor import annotate
+        from diann_runner.prozor.ahocorasick import AhoCorasickPure
+
+        peptides = ["GVFRR", "DTHK", "UNIQUE"]
+        serial = list(annotate_peptides(peptides, proteins, backend="ahocorapy"))
+
+        monkeypatch.setattr(AhoCorasickPure, "releases_gil", True)
+        monkeypatch.setattr(annotate, "_PARALLEL_MIN_PROTEINS", 1)
+        monkeypatch.setattr(annotate.os, "cpu_count", lambda: 2)
+        threaded = list(annotate_peptides(peptides, proteins, backend="ahocorapy"))
+
+        assert threaded == serial
+
+    def test_annotation_result_iterates_annotations(self):
+        """Column-stored matches should come back as PeptideAnnotation objects."""
+        from diann_runner.prozor.annotate import AnnotationResult
+
+        anns = [
+            PeptideAnnotation("PEPA", "PROT1", 0, 4),
+            PeptideAnnotation("PEPB", "PROT2", 3, 7),
+        ]
+        result = AnnotationResult(annotations=anns)
+        assert len(result) == 2
+        assert list(result) == anns
+
+    def test_annotation_result_equality_and_repr(self):
+        """Results with the same matches compare equal, like the old dataclass."""
+        from diann_runner.prozor.annotate import AnnotationResult
+
+        anns = [PeptideAnnotation("PEPA", "PROT1", 0, 4)]
+        result = AnnotationResult(annotations=anns)
+        assert result == AnnotationResult.from_columns(["PEPA"], ["PROT1"], [0], [4])
+        assert result != AnnotationResult(annotations=[])
+        assert repr(result) == f"AnnotationResult(annotations={anns!r})"
+        assert list(AnnotationResult.from_columns(["PEPA"], ["PROT1"], [0], [4])) == anns[:1]
+
     def test_to_dataframe(self, proteins):
         """Should convert to pandas DataFrame."""
         peptides = ["GVFRR"]
@@ -195,6 +243,25 @@ class TestFilterTryptic:
         assert len(filtered) == 0
 
 
+class TestReadFasta:
+    """Test FASTA parsing."""
+
+    def test_multiline_crlf_and_preamble(self, tmp_path):
+        path = tmp_path / "db.fasta"
+        path.write_bytes(
+            b"# preamble\r\n>sp|P1|A desc\r\nMKW\r\nVTF\r\n\r\n>P2\r\nGGG\r\n>P3\r\n"
+        )
+        assert read_fasta(path) == {"sp|P1|A": "MKWVTF", "P2": "GGG", "P3": ""}
+
+    def test_gzipped(self, tmp_path):
+        import gzip
+
+        path = tmp_path / "db.fasta.gz"
+        with gzip.open(path, "wt") as f:
+            f.write(">P1\nMKW\nVTF\n>P2 x\nGGG")
+        assert read_fasta(path) == {"P1": "MKWVTF", "P2": "GGG"}
+
+
 class TestSparseMatrix:
     """Test PeptideProteinMatrix."""
 
@@ -248,6 +315,25 @@ class TestSparseMatrix:
         # PEP1 in 2 proteins, PEP2 in 1, PEP3 in 1
         assert sorted(counts) == [1, 1, 2]
 
+    def test_counts_ignore_inverse_weights(self, simple_annotations):
+        """Weighted matrices should still report match counts."""
+        matrix = PeptideProteinMatrix.from_annotations(
+            simple_annotations, weighting="inverse"
+        )
+        assert sorted(matrix.proteins_per_peptide()) == [1, 1, 2]
+        assert sorted(matrix.peptides_per_protein()) == [1, 1, 2]
+
+    def test_counts_are_independent_copies(self, simple_annotations):
+        """Mutating a returned array should not affect later calls."""
+        matrix = PeptideProteinMatrix.from_annotations(simple_annotations)
+        counts = matrix.proteins_per_peptide()
+        counts[:] = 5
+        assert sorted(matrix.proteins_per_peptide()) == [1, 1, 2]
+        assert len(matrix.proteotypic_peptides()) == 2
+        per_protein = matrix.peptides_per_protein()
+        per_protein[:] = 0
+        assert matrix.peptides_per_protein().sum() == 4
+
     def test_proteotypic_peptides(self, simple_annotations):
         """Should identify proteotypic peptides."""
         matrix = PeptideProteinMatrix.from_annotations(simple_annotations)
@@ -8,15 +8,19 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import pytest
 
-from diann_runner.qc_report import generate, _generate_markdown, _render_pdf
+from diann_runner.qc_report import _generate_markdown, _render_pdf, generate
 from diann_runner.report_figures import (
+    bar_plot,
+    build_quant_matrices,
     create_consistency_histograms,
     create_correlation_matrix,
     create_cv_analysis_plots,
     create_rt_heatmaps,
     create_run_statistics_plots,
-    bar_plot,
+    read_report_parquet,
     remove_common,
+    row_cv,
+    split_replicate_condition,
 )
 
 # Test data paths
@@ -56,6 +60,68 @@ class TestReportFigures:
         result = remove_common([])
         assert result == []
 
+    def test_row_cv_matches_scipy_variation(self):
+        """Test row_cv against scipy's NaN-omitting variation."""
+        import numpy as np
+        from scipy.stats import variation
+
+        values = np.array([[1.0, 2.0, 3.0], [4.0, np.nan, 6.0], [np.nan, np.nan, np.nan]])
+        cv, valid = row_cv(values)
+        expected = np.ma.filled(variation(values[:2], axis=1, nan_policy="omit"), np.nan)
+        np.testing.assert_allclose(cv[:2], expected)
+        assert np.isnan(cv[2])
+        assert valid.sum() == 5
+
+    def test_split_replicate_condition(self):
+        """Test that the last digit run is the replicate."""
+        names = pd.Series(["ctrl_01", "ctrl_02_b", "wt9C_3"])
+        replicate, condition = split_replicate_condition(names)
+        assert replicate.tolist() == ["01", "02", "3"]
+        assert condition.tolist() == ["ctrl_", "ctrl__b", "wt9C_"]
+
+    def test_split_replicate_condition_without_digits(self):
+        """Test that names without a replicate number are rejected."""
+        with pytest.raises(ValueError):
+            split_replicate_condition(pd.Series(["ctrl_01", "blank"]))
+
+    def test_read_report_parquet_filters_rows_and_columns(self, temp_output_dir):
+        """Test that only QC columns and passing precursors are read."""
+        path = temp_output_dir / "report.parquet"
+        pd.DataFrame({
+            "Run": ["a", "b", "c"],
+            "Q.Value": [0.001, 0.5, 0.01],
+            "Precursor.Id": ["P1", "P2", "P3"],
+            "Fragment.Info": ["x", "y", "z"],
+        }).to_parquet(path)
+
+        quant = read_report_parquet(path)
+
+        assert list(quant.columns) == ["Run", "Q.Value", "Precursor.Id"]
+        assert quant["Precursor.Id"].tolist() == ["P1", "P3"]
+
+    def test_build_quant_matrices_sorts_run_columns_like_pivot_table(self):
+        """Run column order should not depend on the order of report rows."""
+        quant = pd.DataFrame({
+            "File.Name": ["r2", "r1", "r3", "r2", "r1"],
+            "Precursor.Id": ["A", "A", "A", "B", "B"],
+            "Protein.Group": ["PA", "PA", "PA", "PB", "PB"],
+            "Genes": ["GA", "GA", "GA", "GB", "GB"],
+            "Precursor.Normalised": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "PG.MaxLFQ": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "Genes.MaxLFQ": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "PG.Q.Value": 0.0,
+            "GG.Q.Value": 0.0,
+        })
+        expected = quant.pivot_table(
+            index="Precursor.Id", columns="File.Name", values="Precursor.Normalised", aggfunc="sum"
+        )
+
+        pr, pg, genes = build_quant_matrices(quant)
+
+        for matrix in (pr, pg, genes):
+            assert list(matrix.columns) == list(expected.columns) == ["r1", "r2", "r3"]
+        assert pr.loc["B", "r2"] == expected.loc["B", "r2"]
+
     def test_bar_plot_creates_figure(self):
         """Test that bar_plot returns a matplotlib Figure."""
         x = ["a", "b", "c"]
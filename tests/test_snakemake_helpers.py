@@ -7,6 +7,7 @@ from pathlib import Path
 
 from unittest.mock import patch
 
+from diann_runner import snakemake_helpers
 from diann_runner.snakemake_helpers import (
     get_diann_input_dependency,
     get_diann_input_path,
@@ -102,6 +103,92 @@ class TestSnakemakeHelpers(unittest.TestCase):
             self.assertIn("out-DIANN_quantC/WU1_report.tsv", names)
             self.assertIn("qc_result/dataset.csv", names)
 
+    def test_zip_diann_results_round_trips_file_contents(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            output_dir = tmp_path / "out-DIANN_quantC"
+            (output_dir / "sub").mkdir(parents=True)
+            payloads = {
+                "out-DIANN_quantC/empty.txt": b"",
+                "out-DIANN_quantC/report.tsv": b"protein\tquantity\n" * 50000,
+                "out-DIANN_quantC/sub/random.bin": os.urandom(300_000),
+            }
+            for arcname, data in payloads.items():
+                (tmp_path / arcname).write_bytes(data)
+
+            zip_path = tmp_path / "Result_WUTEST.zip"
+            zip_diann_results(str(output_dir), str(zip_path))
+
+            with zipfile.ZipFile(zip_path) as zip_file:
+                self.assertIsNone(zip_file.testzip())
+                self.assertEqual(set(zip_file.namelist()), set(payloads))
+                for arcname, data in payloads.items():
+                    self.assertEqual(zip_file.read(arcname), data)
+            # No temp files left next to the archive
+            self.assertEqual(list(tmp_path.glob("*.deflate")), [])
+
+    def test_precompressed_zipfile_appends_raw_deflate_entries(self):
+        import io
+        import zlib
+
+        def deflate(data):
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+            return compressor.compress(data) + compressor.flush()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            zip_path = Path(tmpdir) / "out.zip"
+            payloads = {"a.txt": b"alpha" * 1000, "b/c.bin": os.urandom(5000), "empty": b""}
+            with snakemake_helpers._PrecompressedZipFile(zip_path, "w") as zipf:
+                for name, data in payloads.items():
+                    zinfo = zipfile.ZipInfo(name)
+                    zinfo.CRC = zlib.crc32(data)
+                    zinfo.file_size = len(data)
+                    raw = deflate(data)
+                    zinfo.compress_size = len(raw)
+                    zipf.write_deflated(zinfo, io.BytesIO(raw), zip64=False)
+                # Regular writes still work after pre-deflated entries
+                zipf.writestr("regular.txt", b"plain")
+                with self.assertWarnsRegex(UserWarning, "Duplicate name"):
+                    zinfo = zipfile.ZipInfo("a.txt")
+                    zinfo.CRC, zinfo.file_size = zlib.crc32(b""), 0
+                    raw = deflate(b"")
+                    zinfo.compress_size = len(raw)
+                    zipf.write_deflated(zinfo, io.BytesIO(raw), zip64=False)
+
+            with zipfile.ZipFile(zip_path) as zip_file:
+                self.assertIsNone(zip_file.testzip())
+                self.assertEqual(zip_file.read("b/c.bin"), payloads["b/c.bin"])
+                self.assertEqual(zip_file.read("empty"), b"")
+                self.assertEqual(zip_file.read("regular.txt"), b"plain")
+                self.assertEqual(zip_file.getinfo("b/c.bin").compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_write_zip_parallel_bounds_pending_temp_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            entries = []
+            for i in range(12):
+                src = tmp_path / f"file{i}.txt"
+                src.write_bytes(b"x" * 1000 * (i + 1))
+                entries.append((src, src.name))
+            deflate = snakemake_helpers._deflate_to_tempfile
+            seen = []
+
+            def counting_deflate(*args):
+                seen.append(len(list(tmp_path.glob("*.deflate"))))
+                return deflate(*args)
+
+            zip_path = tmp_path / "out.zip"
+            with patch.object(snakemake_helpers, "_deflate_to_tempfile", counting_deflate):
+                snakemake_helpers._write_zip_parallel(zip_path, entries, max_workers=1)
+
+            # max_workers=1 keeps at most two files in flight, so at most one
+            # finished temp file waits while the next one is being written
+            self.assertEqual(len(seen), 12)
+            self.assertLessEqual(max(seen), 1)
+            with zipfile.ZipFile(zip_path) as zip_file:
+                self.assertEqual(zip_file.namelist(), [name for _, name in entries])
+            self.assertEqual(list(tmp_path.glob("*.deflate")), [])
+
     def test_write_outputs_yml_can_register_single_combined_zip(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             tmp_path = Path(tmpdir)